@@ -0,0 +1,197 @@
+# ***************************************************************************************************************
+#                                                                                                               *
+#                            Hands On Simulation Modeling with Python - Chapter 2                               *
+#                                                                                                               *
+#       This code defines a class `BufferedGenerator` that wraps any of the Chapter 2 generators (the           *
+#       linear congruential generator, the MINSTD Lewis generator and the lagged Fibonacci generator) and       *
+#       exposes them through an API modelled on `numpy.random.Generator`, so that the simulators of the         *
+#       later chapters can use them in place of `random` or `np.random`.                                        *
+#                                                                                                               *
+#       Main Features:                                                                                          *
+#       - `__init__`: Wraps a generator and allocates a large internal uint64 buffer of raw outputs.            *
+#       - `random`, `integers`, `normal`: Serve uniform, integer and Gaussian draws from the buffer. The        *
+#         buffer is refilled with the block methods of the wrapped generator, one vectorized call at a time.    *
+#       - `choice`, `shuffle`: Sample from a sequence and permute it in place using random sort keys.           *
+#                                                                                                               *
+#       Example Workflow:                                                                                       *
+#       - Wrap each Chapter 2 generator in a `BufferedGenerator`.                                               *
+#       - Run the same Monte Carlo Pi estimation with each of them and with NumPy's default generator.          *
+#       - Compare the estimates and the throughput in samples per second.                                       *
+#                                                                                                               *
+# ***************************************************************************************************************
+
+
+
+import os
+import sys
+import time
+import numpy as np
+
+
+CHAPTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ['Linear Congruential', 'Learmouth Lewis Algorithm', 'Lagged Fibonacci Generator']:
+    sys.path.append(os.path.join(CHAPTER_DIR, folder))                        # Folders with spaces in their names cannot be packages
+
+import linear_congruential_generator
+import learnmouth_lewis
+import fibonacci_generator
+
+
+class BufferedGenerator:
+    def __init__(self, source, buffer_size=2**20):
+        self.source = source
+        self.buffer_size = buffer_size
+        self._fill, self.low, self.span = self._describe_source(source)
+        if self.span > 2**53 and self.span & (self.span - 1):
+            raise ValueError("Generators with more than 53 bits of output must have a power-of-two range.")
+        self.draws_per_double = max(1, int(np.ceil(53 / np.log2(self.span)))) if self.span <= 2**53 else 1
+        self._buffer = np.empty(0, dtype=np.uint64)
+        self._position = 0
+
+    @staticmethod
+    def _describe_source(source):
+        """Return the block method of the wrapped generator and the range [low, low + span) of its outputs."""
+        if hasattr(source, 'generate_block'):                                        # Linear congruential generator
+            return source.generate_block, 0, int(source.modulus)
+        if hasattr(source, 'generate_integers'):                                     # MINSTD, outputs in [1, m - 1]
+            return source.generate_integers, 1, int(source.modulus) - 1
+        if hasattr(source, 'mask'):                                                  # Lagged Fibonacci generator
+            return source.generate_numbers, 0, int(source.mask) + 1
+        raise TypeError(f"Unsupported generator type: {type(source).__name__}")
+
+    def _take(self, count):
+        """Return the next count raw values, shifted to start at zero, refilling the buffer as needed."""
+        parts = []
+        while count > 0:
+            if self._position == len(self._buffer):
+                self._buffer = np.asarray(self._fill(self.buffer_size), dtype=np.uint64) - np.uint64(self.low)
+                self._position = 0
+            available = min(count, len(self._buffer) - self._position)
+            parts.append(self._buffer[self._position:self._position + available])
+            self._position += available
+            count -= available
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def _shape(size):
+        """Return the output shape and the number of values for a NumPy-style size argument."""
+        if size is None:
+            return None, 1
+        shape = (size,) if np.isscalar(size) else tuple(size)
+        return shape, int(np.prod(shape))
+
+    @staticmethod
+    def _finish(values, shape):
+        """Reshape the flat values to the requested shape, or return a scalar if size was None."""
+        if shape is None:
+            return values[0]
+        return values.reshape(shape)
+
+    def _uniforms(self, count):
+        """Return count float64 uniforms in [0, 1) with 53 bits of resolution."""
+        if self.span > 2**53:
+            shift = np.uint64(self.span.bit_length() - 1 - 53)
+            return (self._take(count) >> shift) * 2.0**-53
+        raw = self._take(count * self.draws_per_double).reshape(count, self.draws_per_double)
+        u = np.zeros(count)
+        for column in range(self.draws_per_double - 1, -1, -1):                     # Horner scheme in base span
+            u = (u + raw[:, column]) / self.span
+        return np.minimum(u, np.nextafter(1.0, 0.0))                                # Guard against rounding up to 1.0
+
+    def random(self, size=None):
+        """Return uniform floats in [0, 1)."""
+        shape, count = self._shape(size)
+        return self._finish(self._uniforms(count), shape)
+
+    def integers(self, low, high=None, size=None, endpoint=False):
+        """Return random integers from [low, high), or [low, high] if endpoint is True."""
+        if high is None:
+            low, high = 0, low
+        if endpoint:
+            high = high + 1
+        if high <= low:
+            raise ValueError("high must be greater than low.")
+        shape, count = self._shape(size)
+        values = low + np.floor(self._uniforms(count) * (high - low)).astype(np.int64)
+        return self._finish(values, shape)
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        """Return Gaussian samples using the Box-Muller transform on pairs of uniforms."""
+        shape, count = self._shape(size)
+        half = (count + 1) // 2
+        u = self._uniforms(2 * half).reshape(2, half)
+        radius = np.sqrt(-2.0 * np.log1p(-u[0]))                                     # 1 - u lies in (0, 1], so the log is finite
+        angle = 2.0 * np.pi * u[1]
+        z = np.concatenate((radius * np.cos(angle), radius * np.sin(angle)))[:count]
+        return self._finish(loc + scale * z, shape)
+
+    def choice(self, a, size=None, replace=True, p=None):
+        """Draw elements of a (or of range(a) if a is an integer) with or without replacement."""
+        population = np.arange(a) if np.isscalar(a) else np.asarray(a)
+        n = len(population)
+        shape, count = self._shape(size)
+        if replace:
+            if p is None:
+                index = np.floor(self._uniforms(count) * n).astype(np.int64)
+            else:
+                cdf = np.cumsum(p, dtype=float)
+                index = np.searchsorted(cdf / cdf[-1], self._uniforms(count), side='right')
+        else:
+            if count > n:
+                raise ValueError("Cannot take a larger sample than population when replace is False.")
+            if p is not None:
+                raise ValueError("Weighted sampling without replacement is not supported.")
+            index = np.argpartition(self._uniforms(n), count - 1)[:count] if count < n else np.argsort(self._uniforms(n))
+        return self._finish(population[index], shape)
+
+    def shuffle(self, x):
+        """Shuffle a mutable sequence or a NumPy array along its first axis, in place."""
+        order = np.argsort(self._uniforms(len(x)))                                  # Random sort keys give a uniform permutation
+        if isinstance(x, np.ndarray):
+            x[...] = x[order]
+        else:
+            x[:] = [x[i] for i in order]
+
+
+def estimate_pi(rng, num_samples, chunk_size=2**20):
+    """Estimate Pi by sampling the unit square in vectorized chunks."""
+    inside = 0
+    for start in range(0, num_samples, chunk_size):
+        count = min(chunk_size, num_samples - start)
+        x = rng.random(count)
+        y = rng.random(count)
+        inside += np.count_nonzero(x * x + y * y <= 1.0)
+    return 4 * inside / num_samples
+
+
+def main():
+    generators = {
+        'LCG (Numerical Recipes)': BufferedGenerator(linear_congruential_generator.LinearCongruentialGenerator(1664525, 1013904223, 2**32, 1)),
+        'MINSTD (Lewis)': BufferedGenerator(learnmouth_lewis.MinimalStandardGenerator(seed=1)),
+        'Lagged Fibonacci (273, 607)': BufferedGenerator(fibonacci_generator.LaggedFibonacciGenerator(seed=1, lags=(273, 607), bits=64)),
+        'NumPy PCG64': np.random.default_rng(1),
+    }
+    num_samples = 10**7
+
+    print("\n\n", "*" * 80, "\n")
+    print(f"  Monte Carlo Pi estimation with N = {num_samples:,}\n")
+    for name, rng in generators.items():
+        start = time.perf_counter()
+        pi_estimate = estimate_pi(rng, num_samples)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<28} Pi = {pi_estimate:.5f}   {num_samples / elapsed / 1e6:8.2f} M samples/s")
+
+    rng = generators['MINSTD (Lewis)']
+    deck = list(range(10))
+    rng.shuffle(deck)
+    print(f"\n  integers(1, 7, 10): {rng.integers(1, 7, 10)}")
+    print(f"  normal(size=3):     {rng.normal(size=3)}")
+    print(f"  choice(cities, 3):  {rng.choice(['Rome', 'Paris', 'Tokyo', 'Berlin'], 3, replace=False)}")
+    print(f"  shuffled deck:      {deck}")
+    print("\n", "*" * 80, "\n\n")
+
+
+if __name__ == "__main__":
+    main()
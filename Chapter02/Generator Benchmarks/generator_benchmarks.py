@@ -0,0 +1,163 @@
+# ***************************************************************************************************************
+#                                                                                                               *
+#                            Hands On Simulation Modeling with Python - Chapter 2                               *
+#                                                                                                               *
+#       This code benchmarks the Chapter 2 generator classes: the linear congruential generator, the Lewis      *
+#       (MINSTD) generator, the lagged Fibonacci generator, the RandomNumberGenerator of the uniformity test    *
+#       and the PasswordGenerator. Both the original per-value loops and the vectorized block modes are         *
+#       measured, and NumPy's PCG64 is included as a baseline.                                                  *
+#                                                                                                               *
+#       Main Features:                                                                                          *
+#       - `measure_case`: Runs one benchmark in a fresh process, so that its peak resident set size is not      *
+#         polluted by earlier runs. It reports the best wall time over a few repeats, the values per second,    *
+#         the peak RSS and the bytes allocated per value (traced with tracemalloc in a separate run).           *
+#       - `run_benchmarks`: Sweeps every case over the requested sizes, skipping the per-value loops above      *
+#         their size limit, and writes the results with the environment details to a JSON file.                 *
+#       - `print_report`: Prints the results with the throughput relative to PCG64 at the same size.            *
+#                                                                                                               *
+#       Example Workflow:                                                                                       *
+#       - Run the script to benchmark sizes from 10^3 to 10^8.                                                  *
+#       - Keep the JSON file of each version and compare them to track regressions and improvements.            *
+#                                                                                                               *
+# ***************************************************************************************************************
+
+
+
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import datetime
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from tabulate import tabulate
+
+
+CHAPTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ['Linear Congruential', 'Learmouth Lewis Algorithm', 'Lagged Fibonacci Generator',
+               'Uniformity Test', 'Password Generator']:
+    sys.path.append(os.path.join(CHAPTER_DIR, folder))                        # Make the sibling scripts importable by name
+
+import linear_congruential_generator
+import learnmouth_lewis
+import fibonacci_generator
+import uniformity_test
+import random_password_generator
+
+
+# Each case maps to (setup, max_size): setup() returns a function that produces n values.
+# Passwords count one value per character.
+CASES = {
+    'lcg-loop': (lambda: linear_congruential_generator.LinearCongruentialGenerator(1664525, 1013904223, 2**32, 1).generate_values, 10**6),
+    'lcg-block': (lambda: linear_congruential_generator.LinearCongruentialGenerator(1664525, 1013904223, 2**32, 1).generate_block, None),
+    'lewis-loop': (lambda: learnmouth_lewis.LinearCongruentialGenerator(16807, 0, 2**31 - 1, 1).generate_values, 10**6),
+    'minstd-block': (lambda: learnmouth_lewis.MinimalStandardGenerator(seed=1).generate_uniforms, None),
+    'lagged-fibonacci-loop': (lambda: fibonacci_generator.LinearCongruentialGenerator(1, 1, 2**32).generate_numbers, 10**6),
+    'lagged-fibonacci-block': (lambda: fibonacci_generator.LaggedFibonacciGenerator(seed=1, lags=(273, 607)).generate_numbers, None),
+    'uniformity-rng-loop': (lambda: uniformity_test.RandomNumberGenerator().generate_random_numbers, 10**6),
+    'password-loop': (lambda: random_password_generator.PasswordGenerator().generate_password, 10**6),
+    'password-bulk': (lambda: (lambda n, generator=random_password_generator.PasswordGenerator():
+                               generator.generate_many(max(1, n // 16), 16)), 10**7),
+    'pcg64': (lambda: np.random.default_rng(1).random, None),
+}
+BASELINE = 'pcg64'
+
+
+def _peak_rss_mb():
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10             # Bytes on macOS, kilobytes on Linux
+
+
+def _run_case(case, size, repeats):
+    """Benchmark one case at one size; executed inside a fresh worker process."""
+    setup, _ = CASES[case]
+    rss_before = _peak_rss_mb()
+    best = float('inf')
+    for _ in range(repeats):
+        produce = setup()
+        start = time.perf_counter()
+        values = produce(size)
+        best = min(best, time.perf_counter() - start)
+        del values
+    peak_rss = _peak_rss_mb()
+
+    produce = setup()
+    tracemalloc.start()
+    values = produce(size)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del values
+
+    return {
+        'case': case,
+        'size': size,
+        'seconds': best,
+        'values_per_second': size / best,
+        'peak_rss_mb': peak_rss,
+        'rss_growth_mb': peak_rss - rss_before,
+        'allocated_bytes_per_value': traced_peak / size,
+    }
+
+
+def measure_case(case, size, repeats=3):
+    """Run _run_case in a fresh process so that peak RSS reflects this case only."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_case, case, size, repeats).result()
+
+
+def run_benchmarks(sizes, output_path, cases=None, repeats=3):
+    """Benchmark every case at every size allowed for it and write the results as JSON."""
+    results = []
+    for case in cases or CASES:
+        _, max_size = CASES[case]
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            result = measure_case(case, size, repeats if size < 10**7 else 1)
+            results.append(result)
+            print(f"  {case:<24} n={size:<10.0e} {result['values_per_second'] / 1e6:10.2f} M values/s")
+
+    report = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    with open(output_path, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+    return report
+
+
+def print_report(report):
+    """Print the results as a table, with the throughput relative to the PCG64 baseline."""
+    baseline = {r['size']: r['values_per_second'] for r in report['results'] if r['case'] == BASELINE}
+    rows = []
+    for r in report['results']:
+        ratio = r['values_per_second'] / baseline[r['size']] if r['size'] in baseline else float('nan')
+        rows.append([r['case'], f"{r['size']:.0e}", f"{r['values_per_second'] / 1e6:.2f}", f"{ratio:.3f}",
+                     f"{r['peak_rss_mb']:.1f}", f"{r['allocated_bytes_per_value']:.1f}"])
+    headers = ["Case", "N", "M values/s", "vs PCG64", "Peak RSS (MB)", "Bytes/value"]
+    print(tabulate(rows, headers=headers, tablefmt='fancy_grid'))
+
+
+def main():
+    sizes = [10**k for k in range(3, 9)]
+    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results.json')
+    print("\n\n---> Running Chapter 2 generator benchmarks\n")
+    report = run_benchmarks(sizes, output_path)
+    print()
+    print_report(report)
+    print(f"\n---> Results written to {output_path}\n\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,12 @@
 #       predefined parameters, and it generates 100 numbers. The generated numbers are then     *
 #       printed to the console.                                                                 *
 #                                                                                               *
+#       The LaggedFibonacciGenerator class is a proper additive/subtractive lagged Fibonacci    *
+#       generator, x[n] = x[n - j] (+/-) x[n - k] mod 2^bits, with configurable lags such as    *
+#       (24, 55) or (273, 607). Its state lives in a uint64 ring buffer of the last k values.   *
+#       Since every output depends only on values at least min(j, k) steps back, each refill    *
+#       produces min(j, k) outputs with a single vectorized NumPy operation.                    *
+#                                                                                               *
 # ***********************************************************************************************
 
 
@@ -31,6 +37,54 @@ class LinearCongruentialGenerator:
             self.x1 = x
         return numbers
 
+
+class LaggedFibonacciGenerator:
+    def __init__(self, seed=1, lags=(24, 55), bits=32, operation='+'):
+        short_lag, long_lag = sorted(lags)
+        if short_lag < 1 or short_lag == long_lag:
+            raise ValueError("Lags must be two distinct positive integers.")
+        if not 1 <= bits <= 64:
+            raise ValueError("The modulus must be 2^bits with 1 <= bits <= 64.")
+        if operation not in ('+', '-'):
+            raise ValueError("Operation must be '+' (additive) or '-' (subtractive).")
+        self.short_lag = short_lag
+        self.long_lag = long_lag
+        self.operation = operation
+        self.mask = np.uint64(2**bits - 1)
+        self.buffer = np.random.SeedSequence(seed).generate_state(long_lag, dtype=np.uint64) & self.mask
+        self.buffer[0] |= np.uint64(1)                                              # At least one odd seed gives the full period
+        self.position = 0                                                           # Index of the oldest value, x[n - k]
+
+    def _combine(self, recent, old):
+        """Apply the lagged Fibonacci operation element-wise, wrapping modulo 2^bits."""
+        if self.operation == '+':
+            return (recent + old) & self.mask
+        return (recent - old) & self.mask
+
+    def next_value(self):
+        """Produce a single value by stepping the ring buffer."""
+        k, j = self.long_lag, self.short_lag
+        recent = self.buffer[(self.position + k - j) % k]
+        with np.errstate(over='ignore'):
+            x = self._combine(recent, self.buffer[self.position])
+        self.buffer[self.position] = x
+        self.position = (self.position + 1) % k
+        return int(x)
+
+    def generate_numbers(self, count):
+        """Return the next count values as a uint64 array, min(j, k) values per vectorized refill."""
+        k, j = self.long_lag, self.short_lag
+        work = np.empty(k + count, dtype=np.uint64)
+        work[:k - self.position] = self.buffer[self.position:]                     # Unroll the ring buffer, oldest value first
+        work[k - self.position:k] = self.buffer[:self.position]
+        with np.errstate(over='ignore'):
+            for start in range(k, k + count, j):
+                stop = min(start + j, k + count)
+                work[start:stop] = self._combine(work[start - j:stop - j], work[start - k:stop - k])
+        self.buffer = work[-k:].copy()
+        self.position = 0
+        return work[k:]
+
 def main():
     # Initialize parameters
     seed1 = 1
@@ -41,5 +95,10 @@ def main():
     for num in numbers:
         print(num)
 
+    lagged_generator = LaggedFibonacciGenerator(seed=2024, lags=(24, 55), bits=32)   # Additive LFG with lags (24, 55)
+    values = lagged_generator.generate_numbers(1000000)
+    print(f"\n---> Lagged Fibonacci (24, 55), first values: {values[:5]}")
+    print(f"---> Mean of 10^6 values / 2^32: {values.mean() / 2**32:.4f}")
+
 if __name__ == "__main__":
     main()
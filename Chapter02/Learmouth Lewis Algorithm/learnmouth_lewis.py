@@ -11,6 +11,12 @@
 #       generator with specified parameters and generates 99 values, which are then printed to          *
 #       the console.                                                                                    *
 #                                                                                                       *
+#       The MinimalStandardGenerator class is an integer-exact MINSTD (Lewis-Goodman-Miller) engine.    *
+#       Single steps use Schrage's method, so a * x mod m never overflows, while generate_integers and  *
+#       generate_uniforms fill whole NumPy arrays with 64-bit products, one vectorized chunk at a time. *
+#       Because x[n + k] = a^k * x[n] mod m, the generator can jump ahead in O(log k), and substream    *
+#       splits the period into non-overlapping slices that N workers can draw independently.            *
+#                                                                                                       *
 # *******************************************************************************************************
 
 
@@ -32,6 +38,79 @@ class LinearCongruentialGenerator:
             values.append(u)
         return values
 
+
+class MinimalStandardGenerator:
+    def __init__(self, seed=1, a=16807, modulus=2**31 - 1):
+        if modulus > 2**32:
+            raise ValueError("The modulus must be at most 2**32 to stay exact in uint64.")
+        if not 1 < a < modulus:
+            raise ValueError(f"The multiplier must be an integer in [2, {modulus - 1}].")
+        if not 1 <= seed < modulus:
+            raise ValueError(f"Seed must be an integer in [1, {modulus - 1}].")
+        self.a = a
+        self.modulus = modulus
+        self.q, self.r = divmod(modulus, a)                                         # Schrage decomposition m = a * q + r
+        if self.r >= self.q:
+            raise ValueError("Schrage's method requires m mod a < m // a.")
+        self.x = int(seed)
+        self._powers = None                                                         # Cached a^j mod m for block generation
+
+    def next_value(self):
+        """Advance one step with Schrage's method and return the new integer state."""
+        hi, lo = divmod(self.x, self.q)
+        x = self.a * lo - self.r * hi
+        self.x = x if x > 0 else x + self.modulus
+        return self.x
+
+    def jump(self, n):
+        """Advance the generator by n steps in O(log n) using a^n mod m."""
+        self.x = (pow(self.a, n, self.modulus) * self.x) % self.modulus
+        return self.x
+
+    def _build_powers(self, chunk_size):
+        """Compute a^j mod m for j = 0..chunk_size by repeated doubling."""
+        m = np.uint64(self.modulus)
+        powers = np.empty(chunk_size + 1, dtype=np.uint64)
+        powers[0] = 1
+        filled = 1
+        while filled <= chunk_size:
+            step = min(filled, chunk_size + 1 - filled)
+            powers[filled:filled + step] = (np.uint64(pow(self.a, filled, self.modulus)) * powers[:step]) % m
+            filled += step
+        self._powers = powers
+
+    def generate_integers(self, count, chunk_size=2**16):
+        """Return the next count integer states as a uint64 array."""
+        out = np.empty(count, dtype=np.uint64)
+        if count == 0:
+            return out
+        chunk_size = min(chunk_size, count)
+        if self._powers is None or len(self._powers) < chunk_size + 1:
+            self._build_powers(chunk_size)
+        m = np.uint64(self.modulus)
+
+        out[:chunk_size] = (self._powers[1:chunk_size + 1] * np.uint64(self.x)) % m    # Products stay below 2^62
+        a_k = self._powers[chunk_size]
+        for start in range(chunk_size, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            out[start:stop] = (a_k * out[start - chunk_size:stop - chunk_size]) % m
+
+        self.x = int(out[-1])
+        return out
+
+    def generate_uniforms(self, count, chunk_size=2**16):
+        """Return the next count uniforms in (0, 1) as a float64 array."""
+        return self.generate_integers(count, chunk_size) / self.modulus
+
+    def substream(self, index, num_streams):
+        """Return a new generator positioned at the start of slice index out of num_streams."""
+        if not 0 <= index < num_streams:
+            raise ValueError("Substream index must be in [0, num_streams).")
+        stream_length = (self.modulus - 1) // num_streams                           # The full period of MINSTD is m - 1
+        stream = MinimalStandardGenerator(self.x, self.a, self.modulus)
+        stream.jump(index * stream_length)
+        return stream
+
 def main():
     # Initialize parameters
     a = 75
@@ -43,6 +122,14 @@ def main():
     for value in values:
         print(value)
 
+    minstd = MinimalStandardGenerator(seed=1)                                       # Integer-exact MINSTD stream
+    uniforms = minstd.generate_uniforms(10000)
+    print(f"\n---> MINSTD state after 10000 steps: {minstd.x} (expected 1043618065)")
+    print(f"---> First uniforms: {uniforms[:5]}")
+    streams = [minstd.substream(i, 4) for i in range(4)]                            # Non-overlapping slices for 4 workers
+    for i, stream in enumerate(streams):
+        print(f"---> Substream {i} first value: {stream.generate_uniforms(1)[0]:.10f}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
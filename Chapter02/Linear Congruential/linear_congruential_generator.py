@@ -10,6 +10,13 @@
 #       predefined parameters, and it generates 100 numbers. The generated numbers are then     *
 #       printed to the console.                                                                 *
 #                                                                                               *
+#       Block mode:                                                                             *
+#       - `affine_power`: Raises the affine map x -> (a * x + c) mod m to the k-th power        *
+#         with modular exponentiation, so that x[n + k] = (A_k * x[n] + C_k) mod m.             *
+#       - `skip`: Jumps the generator n steps ahead in O(log n) operations.                     *
+#       - `generate_block`: Fills a preallocated uint64 NumPy array one vectorized chunk        *
+#         at a time, each chunk being computed from the previous one in a single step.          *
+#                                                                                               *
 # ***********************************************************************************************
 
 
@@ -22,6 +29,7 @@ class LinearCongruentialGenerator:
         self.c = c
         self.modulus = modulus
         self.x = initial_value
+        self._offset_table = None                                                   # Cached (A_j, C_j) coefficients for block mode
 
     def generate_values(self, count):
         values = []
@@ -30,6 +38,68 @@ class LinearCongruentialGenerator:
             values.append(self.x)
         return values
 
+    def affine_power(self, k):
+        """Return (A_k, C_k) such that x[n + k] = (A_k * x[n] + C_k) mod modulus."""
+        if k < 0:
+            raise ValueError("The number of steps must be non-negative.")
+        m = int(self.modulus)
+        a, c = int(self.a) % m, int(self.c) % m
+        A, C = 1 % m, 0
+        while k > 0:
+            if k & 1:
+                A, C = (a * A) % m, (a * C + c) % m
+            a, c = (a * a) % m, (a * c + c) % m
+            k >>= 1
+        return A, C
+
+    def skip(self, n):
+        """Advance the generator by n steps in O(log n) without producing the values."""
+        A, C = self.affine_power(n)
+        self.x = (A * int(self.x) + C) % int(self.modulus)
+        return self.x
+
+    def _build_offset_table(self, chunk_size):
+        """Compute (A_j, C_j) for j = 0..chunk_size by repeated doubling of the table."""
+        m = np.uint64(self.modulus)
+        A = np.empty(chunk_size + 1, dtype=np.uint64)
+        C = np.empty(chunk_size + 1, dtype=np.uint64)
+        A[0], C[0] = 1 % int(self.modulus), 0
+        filled = 1
+        while filled <= chunk_size:
+            step = min(filled, chunk_size + 1 - filled)
+            A_L, C_L = (np.uint64(v) for v in self.affine_power(filled))
+            A[filled:filled + step] = (A_L * A[:step]) % m
+            C[filled:filled + step] = (A_L * C[:step] + C_L) % m
+            filled += step
+        self._offset_table = (A, C)
+
+    def generate_block(self, count, out=None, chunk_size=2**16):
+        """Generate count values into a uint64 array using vectorized jump-ahead chunks."""
+        if int(self.modulus) > 2**32:
+            raise ValueError("Block mode requires a modulus of at most 2**32 to stay exact in uint64.")
+        if out is None:
+            out = np.empty(count, dtype=np.uint64)
+        elif out.dtype != np.uint64 or out.shape != (count,):
+            raise ValueError("The output array must be a one-dimensional uint64 array of length count.")
+        if count == 0:
+            return out
+
+        chunk_size = min(chunk_size, count)
+        if self._offset_table is None or len(self._offset_table[0]) < chunk_size + 1:
+            self._build_offset_table(chunk_size)
+        A, C = self._offset_table
+        m = np.uint64(self.modulus)
+        x = np.uint64(int(self.x) % int(self.modulus))
+
+        out[:chunk_size] = (A[1:chunk_size + 1] * x + C[1:chunk_size + 1]) % m          # First chunk directly from the current state
+        A_k, C_k = A[chunk_size], C[chunk_size]
+        for start in range(chunk_size, count, chunk_size):                              # Each chunk is the previous one advanced k steps
+            stop = min(start + chunk_size, count)
+            out[start:stop] = (A_k * out[start - chunk_size:stop - chunk_size] + C_k) % m
+
+        self.x = int(out[-1])
+        return out
+
 def main():
     # Initialize parameters
     a = 2
@@ -49,6 +119,15 @@ def main():
 
     print("\n\n")
 
+    # Block mode: the same stream produced in vectorized chunks, and a jump straight to an offset
+    block_generator = LinearCongruentialGenerator(a, c, modulus, initial_value)
+    block = block_generator.generate_block(16, chunk_size=4)
+    print(f"---> Block mode matches loop: {np.array_equal(block, np.array(values, dtype=np.uint64))}")
+    skip_generator = LinearCongruentialGenerator(a, c, modulus, initial_value)
+    skip_generator.skip(16)
+    print(f"---> Value after skip(16): {skip_generator.x} (loop value: {values[15]})")
+    print("\n\n")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -11,32 +11,84 @@
 #       another password or exit the program. Error handling is included to ensure the password         *
 #       length is valid.                                                                                *
 #                                                                                                       *
+#       The generate_many method issues passwords in bulk from the operating system's cryptographically *
+#       secure source. It reads one large os.urandom buffer, maps the bytes to the alphabet with        *
+#       vectorized rejection sampling (bytes above the largest multiple of the alphabet size are        *
+#       discarded, so there is no modulo bias) and builds all passwords as a single NumPy array. When   *
+#       require_all_classes is set, passwords missing a lowercase letter, an uppercase letter, a digit  *
+#       or a special character are rejected and redrawn in the same vectorized pass.                    *
+#                                                                                                       *
 # *******************************************************************************************************
 
 
+import os
+import time
 import string
-import random
+import secrets
+import numpy as np
 
 
 class PasswordGenerator:
     def __init__(self):
         self.char_set = list(string.ascii_letters + string.digits + "()!$%^&*@#")           # Character set for password generation
+        self.char_classes = [string.ascii_lowercase, string.ascii_uppercase, string.digits, "()!$%^&*@#"]
+        self.random = secrets.SystemRandom()                                                # Cryptographically secure source
 
     def generate_password(self, length):
         """Generate a random password of a given length."""
         if length < 1:
             raise ValueError("Password length must be at least 1.")
 
-        random.shuffle(self.char_set)                                                       # Shuffle the character set to ensure randomness
-        password = [random.choice(self.char_set) for _ in range(length)]                    # Generate the password
-        random.shuffle(password)                                                            # Shuffle the password to ensure random distribution
+        char_set = self.char_set[:]
+        self.random.shuffle(char_set)                                                       # Shuffle a copy so the shared set is left untouched
+        password = [self.random.choice(char_set) for _ in range(length)]                    # Generate the password
+        self.random.shuffle(password)                                                       # Shuffle the password to ensure random distribution
         return "".join(password)
 
+    def _random_indices(self, count):
+        """Return count unbiased alphabet indices from os.urandom using rejection sampling."""
+        alphabet_size = len(self.char_set)
+        limit = 256 - 256 % alphabet_size                                                   # Largest multiple of the alphabet size
+        indices = np.empty(count, dtype=np.uint8)
+        filled = 0
+        while filled < count:
+            needed = count - filled
+            raw = np.frombuffer(os.urandom(int(needed * 256 / limit) + 64), dtype=np.uint8)
+            accepted = raw[raw < limit][:needed]
+            indices[filled:filled + len(accepted)] = accepted % alphabet_size
+            filled += len(accepted)
+        return indices
+
+    def generate_many(self, n, length, require_all_classes=True):
+        """Generate n passwords of the given length as a NumPy array of strings."""
+        if length < 1:
+            raise ValueError("Password length must be at least 1.")
+        if require_all_classes and length < len(self.char_classes):
+            raise ValueError(f"Password length must be at least {len(self.char_classes)} to include every character class.")
+
+        alphabet = np.frombuffer("".join(self.char_set).encode('ascii'), dtype=np.uint8)
+        class_of = np.array([next(k for k, chars in enumerate(self.char_classes) if c in chars) for c in self.char_set])
+        passwords = self._random_indices(n * length).reshape(n, length)
+        if require_all_classes:
+            pending = np.arange(n)
+            while len(pending) > 0:                                                         # Redraw only the rows that break the policy
+                classes = class_of[passwords[pending]]
+                present = np.stack([(classes == k).any(axis=1) for k in range(len(self.char_classes))], axis=1)
+                pending = pending[~present.all(axis=1)]
+                passwords[pending] = self._random_indices(len(pending) * length).reshape(len(pending), length)
+
+        characters = np.ascontiguousarray(alphabet[passwords])
+        return characters.view(f'S{length}').ravel().astype(f'U{length}')
+
 def main():
     generator = PasswordGenerator()
     print("\n\n", "*"*85)
     print("\n                     (:   Welcome to the Password Generator   :)  \n")
     print("*"*85)
+    start = time.perf_counter()                                                             # Bulk mode: one million credentials at once
+    passwords = generator.generate_many(1000000, 12)
+    elapsed = time.perf_counter() - start
+    print(f"\n---> Generated {len(passwords):,} passwords in {elapsed:.2f} s, for example: {passwords[:3].tolist()}\n")
     while True:
         try:
             length = int(input("\n\n---> How long should your password be? (Minimum length is 1): "))
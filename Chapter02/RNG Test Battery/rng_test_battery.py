@@ -0,0 +1,305 @@
+# ***************************************************************************************************************
+#                                                                                                               *
+#                            Hands On Simulation Modeling with Python - Chapter 2                               *
+#                                                                                                               *
+#       This code defines a battery of empirical tests for uniform random number generators, in the spirit      *
+#       of a small TestU01. Every test is a streaming accumulator: `update` consumes one chunk of uniforms      *
+#       in [0, 1) with vectorized NumPy operations and keeps only a few counters (plus a short carry for        *
+#       tuples, gaps and runs that cross chunk boundaries), and `result` returns the statistic and p-value.     *
+#                                                                                                               *
+#       Main Features:                                                                                          *
+#       - `SerialTest`: Chi-square test on non-overlapping pairs or triples.                                    *
+#       - `GapTest`: Lengths of the gaps between values falling in [alpha, beta).                               *
+#       - `RunsUpTest`: Knuth's runs-up test, with the covariance matrix of the run counts.                     *
+#       - `PokerTest`: Number of distinct values in groups of five digits.                                      *
+#       - `BirthdaySpacingsTest`: Repeated spacings between sorted birthdays, against a Poisson law.            *
+#       - `KolmogorovSmirnovTest`: Binned Kolmogorov-Smirnov distance to the uniform distribution.              *
+#       - `SpectralTest`: DFT test on the bit sequence u >= 0.5, looking for periodic patterns.                 *
+#       - `run_battery`: Runs the independent tests concurrently in a process pool. Each worker regenerates     *
+#         the same reproducible stream, so no sample data is ever shipped between processes.                    *
+#                                                                                                               *
+#       Example Workflow:                                                                                       *
+#       - Pick the Chapter 2 generators to test and NumPy's PCG64 as a reference.                               *
+#       - Run the battery on a stream of the same length for each generator.                                    *
+#       - Print one p-value report per generator.                                                               *
+#                                                                                                               *
+# ***************************************************************************************************************
+
+
+
+import os
+import sys
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy import stats
+from scipy.special import comb
+from tabulate import tabulate
+
+
+CHAPTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ['Linear Congruential', 'Learmouth Lewis Algorithm', 'Lagged Fibonacci Generator']:
+    sys.path.append(os.path.join(CHAPTER_DIR, folder))
+
+import linear_congruential_generator
+import learnmouth_lewis
+import fibonacci_generator
+
+
+def chi_square(observed, probabilities):
+    """Return the chi-square statistic and p-value of observed counts against cell probabilities."""
+    observed = np.asarray(observed, dtype=float)
+    expected = observed.sum() * np.asarray(probabilities, dtype=float)
+    statistic = float(np.sum((observed - expected) ** 2 / expected))
+    return statistic, float(stats.chi2.sf(statistic, len(observed) - 1))
+
+
+class SerialTest:
+    def __init__(self, dimension=2, bins_per_axis=64):
+        self.name = f"Serial ({'pairs' if dimension == 2 else f'{dimension}-tuples'})"
+        self.dimension = dimension
+        self.bins_per_axis = bins_per_axis
+        self.counts = np.zeros(bins_per_axis ** dimension, dtype=np.int64)
+        self.carry = np.empty(0)                                                    # Values left over from an incomplete tuple
+
+    def update(self, chunk):
+        values = np.concatenate((self.carry, chunk))
+        usable = len(values) - len(values) % self.dimension
+        self.carry = values[usable:]
+        digits = np.minimum((values[:usable] * self.bins_per_axis).astype(np.int64), self.bins_per_axis - 1)
+        cells = digits.reshape(-1, self.dimension) @ (self.bins_per_axis ** np.arange(self.dimension))
+        self.counts += np.bincount(cells, minlength=len(self.counts))
+
+    def result(self):
+        return chi_square(self.counts, np.full(len(self.counts), 1 / len(self.counts)))
+
+
+class GapTest:
+    def __init__(self, alpha=0.0, beta=0.5, max_gap=10):
+        self.name = "Gap"
+        self.alpha = alpha
+        self.beta = beta
+        self.max_gap = max_gap
+        self.counts = np.zeros(max_gap + 1, dtype=np.int64)                         # Gap lengths 0..max_gap-1 and >= max_gap
+        self.offset = 0                                                             # Global index of the current chunk
+        self.last_hit = None
+
+    def update(self, chunk):
+        hits = np.flatnonzero((chunk >= self.alpha) & (chunk < self.beta)) + self.offset
+        self.offset += len(chunk)
+        if len(hits) == 0:
+            return
+        if self.last_hit is not None:
+            hits = np.concatenate(([self.last_hit], hits))
+        gaps = np.diff(hits) - 1
+        self.counts += np.bincount(np.minimum(gaps, self.max_gap), minlength=self.max_gap + 1)
+        self.last_hit = hits[-1]
+
+    def result(self):
+        p = self.beta - self.alpha
+        probabilities = p * (1 - p) ** np.arange(self.max_gap)
+        return chi_square(self.counts, np.append(probabilities, (1 - p) ** self.max_gap))
+
+
+class RunsUpTest:
+    # Knuth, The Art of Computer Programming, Vol. 2, Section 3.3.2, Eq. (22)
+    A = np.array([[4529.4, 9044.9, 13568, 18091, 22615, 27892],
+                  [9044.9, 18097, 27139, 36187, 45234, 55789],
+                  [13568, 27139, 40721, 54281, 67852, 83685],
+                  [18091, 36187, 54281, 72414, 90470, 111580],
+                  [22615, 45234, 67852, 90470, 113262, 139476],
+                  [27892, 55789, 83685, 111580, 139476, 172860]])
+    B = np.array([1 / 6, 5 / 24, 11 / 120, 19 / 720, 29 / 5040, 1 / 840])
+
+    def __init__(self):
+        self.name = "Runs up"
+        self.counts = np.zeros(6, dtype=np.int64)                                   # Runs of length 1..5 and >= 6
+        self.n = 0
+        self.last_value = None
+        self.run_length = 0                                                         # Length of the run still in progress
+
+    def update(self, chunk):
+        self.n += len(chunk)
+        previous = np.concatenate(([self.last_value], chunk[:-1])) if self.last_value is not None else None
+        if previous is None:
+            starts = np.concatenate(([0], np.flatnonzero(chunk[1:] <= chunk[:-1]) + 1))
+        else:
+            starts = np.flatnonzero(chunk <= previous)
+        self.last_value = chunk[-1]
+        if len(starts) == 0:
+            self.run_length += len(chunk)
+            return
+        lengths = np.diff(np.concatenate((starts, [len(chunk)])))
+        completed = np.concatenate(([self.run_length + starts[0]], lengths[:-1]))
+        completed = completed[completed > 0]
+        self.counts += np.bincount(np.minimum(completed, 6) - 1, minlength=6)
+        self.run_length = lengths[-1]
+
+    def result(self):
+        deviation = self.counts - self.n * self.B
+        statistic = float(deviation @ self.A @ deviation / (self.n - 6))
+        return statistic, float(stats.chi2.sf(statistic, 6))
+
+
+class PokerTest:
+    def __init__(self, hand_size=5, categories=10):
+        self.name = "Poker"
+        self.hand_size = hand_size
+        self.categories = categories
+        self.counts = np.zeros(hand_size + 1, dtype=np.int64)                       # Hands with r distinct values
+        self.carry = np.empty(0)
+
+    def update(self, chunk):
+        values = np.concatenate((self.carry, chunk))
+        usable = len(values) - len(values) % self.hand_size
+        self.carry = values[usable:]
+        hands = np.sort(np.minimum((values[:usable] * self.categories).astype(np.int64), self.categories - 1)
+                        .reshape(-1, self.hand_size), axis=1)
+        distinct = 1 + np.count_nonzero(np.diff(hands, axis=1), axis=1)
+        self.counts += np.bincount(distinct, minlength=self.hand_size + 1)
+
+    def result(self):
+        k, d = self.hand_size, self.categories
+        stirling = [[1]]                                                            # Stirling numbers of the second kind S(k, r)
+        for i in range(1, k + 1):
+            stirling.append([0] + [r * stirling[i - 1][r] if r < i else 0 for r in range(1, i + 1)])
+            for r in range(1, i + 1):
+                stirling[i][r] += stirling[i - 1][r - 1]
+        probabilities = np.array([comb(d, r, exact=True) * np.prod(range(1, r + 1)) * stirling[k][r] / d ** k
+                                  for r in range(1, k + 1)])
+        observed = self.counts[1:].copy()
+        observed[1] += observed[0]                                                  # Lump the rare "one value" hands with "two values"
+        probabilities[1] += probabilities[0]
+        return chi_square(observed[1:], probabilities[1:])
+
+
+class BirthdaySpacingsTest:
+    def __init__(self, birthdays=512, days=2**24, max_repeats=6):
+        self.name = "Birthday spacings"
+        self.birthdays = birthdays
+        self.days = days
+        self.max_repeats = max_repeats
+        self.counts = np.zeros(max_repeats + 1, dtype=np.int64)                     # Samples with 0..max_repeats-1 and >= max_repeats repeats
+        self.carry = np.empty(0)
+
+    def update(self, chunk):
+        values = np.concatenate((self.carry, chunk))
+        usable = len(values) - len(values) % self.birthdays
+        self.carry = values[usable:]
+        if usable == 0:
+            return
+        birthdays = np.sort((values[:usable] * self.days).astype(np.int64).reshape(-1, self.birthdays), axis=1)
+        spacings = np.sort(np.diff(birthdays, axis=1, prepend=0), axis=1)
+        repeats = np.count_nonzero(np.diff(spacings, axis=1) == 0, axis=1)
+        self.counts += np.bincount(np.minimum(repeats, self.max_repeats), minlength=self.max_repeats + 1)
+
+    def result(self):
+        lam = self.birthdays ** 3 / (4 * self.days)                                 # Repeats are approximately Poisson(m^3 / 4n)
+        probabilities = stats.poisson.pmf(np.arange(self.max_repeats), lam)
+        return chi_square(self.counts, np.append(probabilities, stats.poisson.sf(self.max_repeats - 1, lam)))
+
+
+class KolmogorovSmirnovTest:
+    def __init__(self, bins=2**16):
+        self.name = "Kolmogorov-Smirnov"
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)                               # The empirical CDF is evaluated on this grid
+
+    def update(self, chunk):
+        index = np.minimum((chunk * self.bins).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def result(self):
+        n = self.counts.sum()
+        empirical = np.cumsum(self.counts) / n
+        statistic = float(np.max(np.abs(empirical - np.arange(1, self.bins + 1) / self.bins)))
+        return statistic, float(stats.kstwo.sf(statistic, n))
+
+
+class SpectralTest:
+    def __init__(self, block_size=2**14):
+        self.name = "Spectral (DFT)"
+        self.block_size = block_size
+        self.threshold = np.sqrt(np.log(1 / 0.05) * block_size)                     # 95% of the peaks should fall below it
+        self.peaks_below = 0
+        self.blocks = 0
+        self.carry = np.empty(0)
+
+    def update(self, chunk):
+        values = np.concatenate((self.carry, chunk))
+        usable = len(values) - len(values) % self.block_size
+        self.carry = values[usable:]
+        if usable == 0:
+            return
+        signs = np.where(values[:usable] >= 0.5, 1.0, -1.0).reshape(-1, self.block_size)
+        moduli = np.abs(np.fft.rfft(signs, axis=1)[:, :self.block_size // 2])
+        self.peaks_below += int(np.count_nonzero(moduli < self.threshold))
+        self.blocks += len(signs)
+
+    def result(self):
+        expected = 0.95 * self.block_size / 2 * self.blocks
+        deviation = (self.peaks_below - expected) / np.sqrt(self.blocks * self.block_size * 0.95 * 0.05 / 4)
+        return float(deviation), float(stats.norm.sf(abs(deviation)) * 2)
+
+
+TESTS = {
+    'serial-2': partial(SerialTest, dimension=2, bins_per_axis=64),
+    'serial-3': partial(SerialTest, dimension=3, bins_per_axis=16),
+    'gap': GapTest,
+    'runs-up': RunsUpTest,
+    'poker': PokerTest,
+    'birthday': BirthdaySpacingsTest,
+    'ks': KolmogorovSmirnovTest,
+    'spectral': SpectralTest,
+}
+
+
+def generate_chunks(generator_name, seed, num_samples, chunk_size=2**18):
+    """Yield a reproducible stream of uniforms in [0, 1) from one of the Chapter 2 generators or PCG64."""
+    if generator_name == 'lcg':
+        generator = linear_congruential_generator.LinearCongruentialGenerator(1664525, 1013904223, 2**32, seed)
+        draw = lambda size: generator.generate_block(size) / 2.0**32
+    elif generator_name == 'minstd':
+        generator = learnmouth_lewis.MinimalStandardGenerator(seed=seed)
+        draw = generator.generate_uniforms
+    elif generator_name == 'lagged-fibonacci':
+        generator = fibonacci_generator.LaggedFibonacciGenerator(seed=seed, lags=(273, 607), bits=32)
+        draw = lambda size: generator.generate_numbers(size) / 2.0**32
+    elif generator_name == 'pcg64':
+        draw = np.random.default_rng(seed).random
+    else:
+        raise ValueError(f"Unknown generator: {generator_name}")
+
+    for start in range(0, num_samples, chunk_size):
+        yield draw(min(chunk_size, num_samples - start))
+
+
+def _run_single_test(test_name, generator_name, seed, num_samples):
+    """Run one test over its own copy of the stream; executed inside a worker process."""
+    test = TESTS[test_name]()
+    for chunk in generate_chunks(generator_name, seed, num_samples):
+        test.update(chunk)
+    statistic, p_value = test.result()
+    return test.name, statistic, p_value
+
+
+def run_battery(generator_name, seed=1, num_samples=10**6, test_names=None, max_workers=None):
+    """Run the independent tests concurrently and return (test, statistic, p-value) rows."""
+    test_names = list(TESTS) if test_names is None else test_names
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_single_test, name, generator_name, seed, num_samples) for name in test_names]
+        return [future.result() for future in futures]
+
+
+def main():
+    num_samples = 2 * 10**6
+    for generator_name in ['lcg', 'minstd', 'lagged-fibonacci', 'pcg64']:
+        report = run_battery(generator_name, seed=12345, num_samples=num_samples)
+        rows = [[name, f"{statistic:.4f}", f"{p_value:.4f}", "FAIL" if p_value < 0.001 else ""]
+                for name, statistic, p_value in report]
+        print(f"\n---> Generator: {generator_name} (N = {num_samples:,})")
+        print(tabulate(rows, headers=["Test", "Statistic", "p-value", ""], tablefmt="fancy_grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,39 +11,84 @@
 #       display various random values in a formatted table. Additionally, it randomly selects           *
 #       cities from a predefined list and samples data from a numeric range, printing the results.      *
 #                                                                                                       *
+#       The BatchRandomGenerator class is the vectorized counterpart of RandomGenerator. Each instance  *
+#       owns its own numpy.random.Generator, so seeding one instance never affects another and many     *
+#       generators can run concurrently. Every method takes a size and returns a typed NumPy array;     *
+#       formatting into strings is left to format_values, at the edge, when the values are displayed.   *
+#                                                                                                       *
 # *******************************************************************************************************
 
 
 
 import random
+import numpy as np
 from tabulate import tabulate
 
 
 class RandomGenerator:
     def __init__(self):
         self.seed_initialized = False
+        self.random = random.Random()                                               # Instance-scoped state instead of the global module
 
     def generate_random_float(self):
-        return '{:05.4f}'.format(random.random())
+        return '{:05.4f}'.format(self.random.random())
 
     def generate_random_float_with_seed(self, seed):
-        random.seed(seed)
-        return '{:05.4f}'.format(random.random())
+        self.random.seed(seed)
+        return '{:05.4f}'.format(self.random.random())
 
     def generate_uniform_random_float(self, min_val, max_val):
-        return '{:6.4f}'.format(random.uniform(min_val, max_val))
+        return '{:6.4f}'.format(self.random.uniform(min_val, max_val))
 
     def generate_random_integer(self, min_val, max_val):
-        return random.randint(min_val, max_val)
+        return self.random.randint(min_val, max_val)
 
     def generate_random_range(self, start, stop, step):
-        return random.randrange(start, stop, step)
+        return self.random.randrange(start, stop, step)
 
     def select_random_item(self, items_list):
-        return random.choice(items_list)
+        return self.random.choice(items_list)
 
     def sample_data(self, data_list, k):
-        return random.sample(data_list, k)
+        return self.random.sample(data_list, k)
+
+
+class BatchRandomGenerator:
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)                                      # Each instance has its own isolated stream
+
+    def reseed(self, seed):
+        """Restart this instance's stream from seed without touching any other generator."""
+        self.rng = np.random.default_rng(seed)
+
+    def generate_random_floats(self, size):
+        """Return size floats uniformly distributed in [0, 1)."""
+        return self.rng.random(size)
+
+    def generate_uniform_random_floats(self, min_val, max_val, size):
+        """Return size floats uniformly distributed in [min_val, max_val)."""
+        return self.rng.uniform(min_val, max_val, size)
+
+    def generate_random_integers(self, min_val, max_val, size):
+        """Return size integers in [min_val, max_val], both ends included as in random.randint."""
+        return self.rng.integers(min_val, max_val, size, endpoint=True)
+
+    def generate_random_range(self, start, stop, step, size):
+        """Return size values drawn from range(start, stop, step)."""
+        return start + step * self.rng.integers(0, len(range(start, stop, step)), size)
+
+    def select_random_items(self, items_list, size):
+        """Return size items selected with replacement from items_list."""
+        return self.rng.choice(np.asarray(items_list), size)
+
+    def sample_data(self, data_list, k):
+        """Return k distinct items of data_list."""
+        return self.rng.choice(np.asarray(data_list), k, replace=False)
+
+    @staticmethod
+    def format_values(values, fmt):
+        """Format an array of values into strings, only when they are about to be displayed."""
+        return [fmt.format(value) for value in values]
 
 def main():
     generator = RandomGenerator()
@@ -91,5 +136,20 @@ def main():
     print(f"  {list(data_list)}")
     print(f"Sample Data List: {data_sample}")
 
+    # ------------------------------------------------ Batch generation with NumPy -----------------------------------------------
+
+    batch_generator = BatchRandomGenerator(seed=1)
+    batch_columns = [
+        BatchRandomGenerator.format_values(batch_generator.generate_random_floats(20), '{:05.4f}'),
+        BatchRandomGenerator.format_values(batch_generator.generate_uniform_random_floats(1, 100, 20), '{:6.4f}'),
+        batch_generator.generate_random_integers(-100, 100, 20),
+        batch_generator.generate_random_range(0, 100, 5, 20)
+    ]
+    batch_headers = ["Random Float", "Uniform Float", "Random Integer", "Random Range"]
+    print("\nBatch Generated Random Values (seed=1):")
+    print(tabulate(list(zip(*batch_columns)), headers=batch_headers, tablefmt='fancy_grid'))
+    print(f"Batch Selected Cities: {batch_generator.select_random_items(cities_list, 5).tolist()}")
+    print(f"Batch Sample Data List: {batch_generator.sample_data(data_list, k=5).tolist()}")
+
 if __name__ == "__main__":
     main()
@@ -14,12 +14,19 @@
 #       and the chi-square statistic, are displayed, and a bar chart shows the distribution of      *
 #       the random numbers across intervals.                                                        *
 #                                                                                                   *
+#       The StreamingChiSquareTest class runs the same test on a stream of any length. It           *
+#       consumes generator output chunk by chunk, counts each chunk with np.bincount into a         *
+#       configurable number of bins and keeps only the running counts, so the test takes O(n)       *
+#       time and O(bins) memory. The p-value comes from the chi-square distribution with            *
+#       bins - 1 degrees of freedom.                                                                *
+#                                                                                                   *
 # ***************************************************************************************************
 
 
 
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.stats import chi2
 
 
 class RandomNumberGenerator:
@@ -31,11 +38,23 @@ class RandomNumberGenerator:
         self.u = np.array([])
 
     def generate_random_numbers(self, n=100):
+        values = np.empty(n)                                                    # Preallocate instead of appending per sample
         for i in range(n):
             self.x = np.mod((self.a * self.x + self.c), self.m)
-            self.u = np.append(self.u, self.x / self.m)
+            values[i] = self.x / self.m
+        self.u = np.concatenate((self.u, values))
         return self.u
 
+    def generate_chunks(self, n, chunk_size=10000):
+        """Yield n random numbers in chunks without keeping the whole sequence in memory."""
+        for start in range(0, n, chunk_size):
+            size = min(chunk_size, n - start)
+            chunk = np.empty(size)
+            for i in range(size):
+                self.x = np.mod((self.a * self.x + self.c), self.m)
+                chunk[i] = self.x / self.m
+            yield chunk
+
 
 class ChiSquareTest:
     def __init__(self, u, N=100, s=20):
@@ -43,14 +62,14 @@ class ChiSquareTest:
         self.N = N
         self.s = s
         self.Ns = N / s
-        self.S = np.arange(0, 1, 0.05)
-        self.counts = np.empty(self.S.shape, dtype=int)
+        self.S = np.arange(s) / s                                               # Left edges of the s equal intervals
+        self.counts = np.zeros(s, dtype=int)
         self.V = 0
 
     def perform_test(self):
-        for i in range(self.s):
-            self.counts[i] = len(np.where((self.u >= self.S[i]) & (self.u < self.S[i] + 0.05))[0])
-            self.V += (self.counts[i] - self.Ns) ** 2 / self.Ns
+        bins = np.minimum((np.asarray(self.u) * self.s).astype(np.int64), self.s - 1)
+        self.counts = np.bincount(bins, minlength=self.s)
+        self.V = np.sum((self.counts - self.Ns) ** 2 / self.Ns)
 
     def display_results(self):
         print("\n\n", "*"*50 , "\n")
@@ -64,6 +83,37 @@ class ChiSquareTest:
         plt.show()
 
 
+class StreamingChiSquareTest:
+    def __init__(self, bins=20):
+        if bins < 2:
+            raise ValueError("The test needs at least 2 bins.")
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.N = 0
+
+    def update(self, chunk):
+        """Add the counts of one chunk of uniforms in [0, 1) to the running totals."""
+        chunk = np.asarray(chunk)
+        index = np.minimum((chunk * self.bins).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+        self.N += chunk.size
+
+    def consume(self, chunks):
+        """Feed an iterable of chunks to the test and return the statistic and p-value."""
+        for chunk in chunks:
+            self.update(chunk)
+        return self.statistic(), self.p_value()
+
+    def statistic(self):
+        """Return the chi-square statistic V of the counts accumulated so far."""
+        expected = self.N / self.bins
+        return float(np.sum((self.counts - expected) ** 2) / expected)
+
+    def p_value(self):
+        """Return the upper-tail probability of V under uniformity."""
+        return float(chi2.sf(self.statistic(), self.bins - 1))
+
+
 # Main execution
 def main():
     rng = RandomNumberGenerator()
@@ -74,5 +124,10 @@ def main():
     chi_square_test.display_results()
     chi_square_test.plot_results()
 
+    streaming_test = StreamingChiSquareTest(bins=50)                           # The same test over a stream of 10^7 samples
+    rng = np.random.default_rng(1)
+    V, p_value = streaming_test.consume(rng.random(10**6) for _ in range(10))
+    print(f"  Streaming test: N = {streaming_test.N}, bins = {streaming_test.bins}, V = {V:.2f}, p-value = {p_value:.4f}")
+
 if __name__ == "__main__":
     main()
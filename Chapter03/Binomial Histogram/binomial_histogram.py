@@ -12,20 +12,38 @@
 #       histogram of the generated data using Matplotlib. If no data is available, the          *
 #       plot_histogram method will prompt the user to generate data first.                      *
 #                                                                                               *
+#       For very large N, generate_counts draws the samples in chunks and accumulates exact     *
+#       integer counts over 0..n with np.bincount, so memory stays O(n) whatever the value of   *
+#       N. The draws can be spread over worker processes with independent seeds, and their      *
+#       partial counts are combined with merge_counts. plot_counts computes the probability     *
+#       mass and draws it with one bar per integer value, from the counts alone.                *
+#                                                                                               *
 # ***********************************************************************************************
 
 
 
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
 
 
+def count_binomial_samples(n, p, num_samples, seed, chunk_size=10**7):
+    """Draw num_samples binomial values in chunks and return their counts over 0..n."""
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(n + 1, dtype=np.int64)
+    for start in range(0, num_samples, chunk_size):
+        chunk = rng.binomial(n, p, min(chunk_size, num_samples - start))
+        counts += np.bincount(chunk, minlength=n + 1)
+    return counts
+
+
 class BinomialHistogram:
     def __init__(self, N, n, p):
         self.N = N
         self.n = n
         self.p = p
         self.data = None
+        self.counts = None
 
     def generate_data(self):
         self.data = np.random.binomial(self.n, self.p, self.N)
@@ -38,6 +56,36 @@ class BinomialHistogram:
         plt.hist(self.data, density=True, alpha=0.8, histtype='bar', color='green', ec='black')
         plt.show()
 
+    def generate_counts(self, num_workers=1, seed=None, chunk_size=10**7):
+        """Accumulate exact counts of N samples in chunks, optionally over several worker processes."""
+        seeds = np.random.SeedSequence(seed).spawn(num_workers)                       # Independent streams, one per worker
+        shares = [self.N // num_workers + (i < self.N % num_workers) for i in range(num_workers)]
+        if num_workers == 1:
+            self.counts = count_binomial_samples(self.n, self.p, self.N, seeds[0], chunk_size)
+            return self.counts
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            partial_counts = executor.map(count_binomial_samples, [self.n] * num_workers, [self.p] * num_workers,
+                                          shares, seeds, [chunk_size] * num_workers)
+            self.counts = self.merge_counts(*partial_counts)
+        return self.counts
+
+    @staticmethod
+    def merge_counts(*partial_counts):
+        """Combine partial counts, for example from different workers or runs."""
+        return np.sum(partial_counts, axis=0)
+
+    def density(self):
+        """Return the empirical probability mass over 0..n computed from the counts."""
+        return self.counts / self.counts.sum()
+
+    def plot_counts(self):
+        if self.counts is None:
+            print("No counts available. Please generate counts first.")
+            return
+        plt.figure()
+        plt.bar(np.arange(self.n + 1), self.density(), width=1.0, alpha=0.8, color='green', ec='black')
+        plt.show()
+
 
 def main():
     N = 1000
@@ -48,5 +96,10 @@ def main():
     histogram.generate_data()
     histogram.plot_histogram()
 
+    large_histogram = BinomialHistogram(10**8, n, p)                                  # 10^8 samples in O(n) memory
+    counts = large_histogram.generate_counts(num_workers=4, seed=1)
+    print(f"---> Counts over 0..{n}: {counts}")
+    large_histogram.plot_counts()
+
 if __name__ == "__main__":
     main()
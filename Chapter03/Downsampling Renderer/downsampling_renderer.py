@@ -0,0 +1,117 @@
+# ***********************************************************************************************************
+#                                                                                                           *
+#                          Hands On Simulation Modeling with Python - Chapter 3                             *
+#                                                                                                           *
+#       This code defines a level-of-detail layer for plotting very long series. Passing 10^7 points to     *
+#       `plt.plot` takes minutes and gigabytes, while a screen only has a few thousand pixels across, so    *
+#       the series is reduced to a few thousand points that keep its visual shape before it is drawn.       *
+#                                                                                                           *
+#       Main Features:                                                                                      *
+#       - `minmax_downsample`: Splits the series into equal buckets (one per pixel column) and keeps the    *
+#         minimum and the maximum of each bucket, in their original order. The buckets are processed in     *
+#         vectorized chunks, so memory-mapped series never have to be loaded whole.                         *
+#       - `lttb_downsample`: Largest-Triangle-Three-Buckets, which keeps in each bucket the point forming   *
+#         the largest triangle with the previously kept point and the mean of the next bucket.              *
+#       - `plot_downsampled`: Downsamples one series, or every column of a 2-D array, and plots it.         *
+#                                                                                                           *
+#       The random walk, Brownian motion and stock price simulations use the same layer for their plots.    *
+#                                                                                                           *
+# ***********************************************************************************************************
+
+
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+def minmax_downsample(y, x=None, num_buckets=2000, chunk_size=2**22):
+    """Keep the minimum and maximum of each of num_buckets buckets; return the kept x and y values."""
+    y = y if isinstance(y, np.ndarray) else np.asarray(y)                           # Memory-mapped arrays are kept as they are
+    x = x if x is None or isinstance(x, np.ndarray) else np.asarray(x)
+    n = len(y)
+    if n <= 2 * num_buckets:
+        return (np.arange(n) if x is None else np.asarray(x)), np.asarray(y)
+
+    bucket_size = int(np.ceil(n / num_buckets))
+    step = max(1, chunk_size // bucket_size) * bucket_size                          # Whole buckets per chunk
+    kept = [np.array([0])]
+    for start in range(0, n, step):
+        block = np.asarray(y[start:start + step])
+        full = len(block) // bucket_size * bucket_size
+        rows = block[:full].reshape(-1, bucket_size)
+        offsets = np.arange(len(rows)) * bucket_size
+        pairs = [np.column_stack((np.argmin(rows, axis=1) + offsets, np.argmax(rows, axis=1) + offsets))]
+        if full < len(block):                                                       # The last, partial bucket
+            tail = block[full:]
+            pairs.append(np.array([[np.argmin(tail) + full, np.argmax(tail) + full]]))
+        kept.append(np.sort(np.concatenate(pairs), axis=1).ravel() + start)
+    kept.append(np.array([n - 1]))
+    index = np.unique(np.concatenate(kept))
+    return (index if x is None else np.asarray(x[index])), np.asarray(y[index])
+
+
+def lttb_downsample(y, x=None, num_points=2000):
+    """Reduce the series to num_points points with the Largest-Triangle-Three-Buckets algorithm."""
+    y = y if isinstance(y, np.ndarray) else np.asarray(y)
+    x = x if x is None or isinstance(x, np.ndarray) else np.asarray(x)
+    n = len(y)
+    if num_points >= n or num_points < 3:
+        return (np.arange(n) if x is None else np.asarray(x)), np.asarray(y)
+
+    x_values = (lambda a, b: np.arange(a, b, dtype=float)) if x is None else (lambda a, b: np.asarray(x[a:b], dtype=float))
+    edges = np.linspace(1, n - 1, num_points - 1).astype(np.int64)                  # Buckets between the first and last points
+    sizes = np.diff(edges)
+    y_means = np.add.reduceat(np.asarray(y[1:n - 1], dtype=float), edges[:-1] - 1) / sizes
+    if x is None:
+        x_means = (edges[:-1] + edges[1:] - 1) / 2
+    else:
+        x_means = np.add.reduceat(np.asarray(x[1:n - 1], dtype=float), edges[:-1] - 1) / sizes
+
+    index = np.empty(num_points, dtype=np.int64)
+    index[0], index[-1] = 0, n - 1
+    selected_x, selected_y = x_values(0, 1)[0], float(y[0])
+    for i in range(num_points - 2):
+        if i + 1 < num_points - 2:
+            next_x, next_y = x_means[i + 1], y_means[i + 1]
+        else:
+            next_x, next_y = x_values(n - 1, n)[0], float(y[n - 1])
+        start, stop = edges[i], edges[i + 1]
+        bucket_x = x_values(start, stop)
+        bucket_y = np.asarray(y[start:stop], dtype=float)
+        areas = np.abs((selected_x - next_x) * (bucket_y - selected_y) - (selected_x - bucket_x) * (next_y - selected_y))
+        best = int(np.argmax(areas))
+        index[i + 1] = start + best
+        selected_x, selected_y = bucket_x[best], bucket_y[best]
+    return (index if x is None else np.asarray(x[index])), np.asarray(y[index])
+
+
+def plot_downsampled(y, x=None, method='minmax', num_points=4000, ax=None, **plot_kwargs):
+    """Plot a long series, or each column of a 2-D array, after reducing it to about num_points points."""
+    ax = ax or plt.gca()
+    y = y if isinstance(y, np.ndarray) else np.asarray(y)
+    columns = [y] if np.ndim(y) == 1 else [y[:, j] for j in range(np.shape(y)[1])]
+    lines = []
+    for column in columns:
+        if method == 'minmax':
+            xs, ys = minmax_downsample(column, x, num_buckets=num_points // 2)
+        elif method == 'lttb':
+            xs, ys = lttb_downsample(column, x, num_points=num_points)
+        else:
+            raise ValueError("method must be 'minmax' or 'lttb'.")
+        lines.extend(ax.plot(xs, ys, **plot_kwargs))
+    return lines
+
+
+def main():
+    n = 10**7
+    path = np.cumsum(np.random.default_rng(1).standard_normal(n)) / np.sqrt(n)       # A 10^7-step Brownian path
+    fig, axes = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+    for ax, method in zip(axes, ['minmax', 'lttb']):
+        plot_downsampled(path, method=method, ax=ax, linewidth=0.8)
+        ax.set_title(f"{n:,} points drawn with {method} downsampling")
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
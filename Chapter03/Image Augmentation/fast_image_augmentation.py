@@ -0,0 +1,267 @@
+# *************************************************************************************************
+#                                                                                                 *
+#                Hands On Simulation Modeling with Python - Chapter 3                             *
+#                                                                                                 *
+#       This code defines a class FastImageAugmentor, a NumPy-native counterpart of the           *
+#       ImageAugmentor class that does not need TensorFlow. It applies the same augmentations     *
+#       (rotation, width and height shifts, shear, zoom and horizontal flipping), but instead     *
+#       of producing one image at a time it draws a whole batch of random affine matrices and     *
+#       warps many copies of the source image in one vectorized bilinear resampling pass.         *
+#                                                                                                 *
+#       The random_affine_matrices function builds the batch of matrices, and warp_images         *
+#       resamples the image through them, with the 'nearest' fill mode of Keras (coordinates      *
+#       outside the image are clamped to its border). The augment_and_save_images method fans     *
+#       the batches out across a process pool, each worker decoding the source image once, and    *
+#       hands the augmented arrays to a bounded queue served by writer threads, which encode      *
+#       the JPEG files and write them to disk while the workers keep warping.                     *
+#                                                                                                 *
+#       The AugmentedDataset class avoids writing any file at all. It is a lazy, virtual dataset: *
+#       the transform for index i is derived deterministically from (seed, i), each source image  *
+#       is decoded once and kept in an LRU cache, and augmented arrays are produced on demand, by *
+#       random access or in prefetched batches, so consumers can draw an unlimited number of      *
+#       samples.                                                                                  *
+#                                                                                                 *
+# *************************************************************************************************
+
+
+import os
+import queue
+import threading
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+
+
+def random_affine_matrices(rng, count, height, width, rotation_range=10, width_shift_range=0.1,
+                           height_shift_range=0.1, shear_range=0.1, zoom_range=0.1, horizontal_flip=True):
+    """Return count 3x3 matrices mapping output pixel coordinates (x, y, 1) to input coordinates."""
+    theta = np.deg2rad(rng.uniform(-rotation_range, rotation_range, count))
+    shear = np.deg2rad(rng.uniform(-shear_range, shear_range, count))              # Shear is an angle in degrees, as in Keras
+    zoom_x, zoom_y = rng.uniform(1 - zoom_range, 1 + zoom_range, (2, count))
+    shift_x = rng.uniform(-width_shift_range, width_shift_range, count) * width
+    shift_y = rng.uniform(-height_shift_range, height_shift_range, count) * height
+    flip = rng.random(count) < 0.5 if horizontal_flip else np.zeros(count, dtype=bool)
+
+    def stack(a, b, c, d, e, f):
+        matrices = np.zeros((count, 3, 3))
+        matrices[:, 0, 0], matrices[:, 0, 1], matrices[:, 0, 2] = a, b, c
+        matrices[:, 1, 0], matrices[:, 1, 1], matrices[:, 1, 2] = d, e, f
+        matrices[:, 2, 2] = 1
+        return matrices
+
+    zeros, ones = np.zeros(count), np.ones(count)
+    cx, cy = (width - 1) / 2, (height - 1) / 2
+    to_center = stack(ones, zeros, -cx * ones, zeros, ones, -cy * ones)
+    from_center = stack(ones, zeros, (cx + shift_x), zeros, ones, (cy + shift_y))
+    rotation = stack(np.cos(theta), -np.sin(theta), zeros, np.sin(theta), np.cos(theta), zeros)
+    shearing = stack(ones, -np.sin(shear), zeros, zeros, np.cos(shear), zeros)
+    zooming = stack(zoom_x, zeros, zeros, zeros, zoom_y, zeros)
+    flipping = stack(np.where(flip, -1.0, 1.0), zeros, zeros, zeros, ones, zeros)
+    return from_center @ rotation @ shearing @ zooming @ flipping @ to_center
+
+
+def warp_images(image, matrices, sub_batch=8):
+    """Resample an (h, w, c) uint8 image through each matrix with bilinear interpolation."""
+    height, width, channels = image.shape
+    ys, xs = np.mgrid[0:height, 0:width]
+    grid = np.stack([xs.ravel(), ys.ravel(), np.ones(height * width)]).astype(np.float32)
+    pixels = image.reshape(-1, channels).astype(np.float32)
+    output = np.empty((len(matrices), height, width, channels), dtype=np.uint8)
+
+    for start in range(0, len(matrices), sub_batch):                               # Bound the size of the gathered arrays
+        source = matrices[start:start + sub_batch, :2, :].astype(np.float32) @ grid
+        sx = np.clip(source[:, 0], 0, width - 1)                                   # 'nearest' fill mode: clamp to the border
+        sy = np.clip(source[:, 1], 0, height - 1)
+        x0 = np.minimum(sx.astype(np.int32), width - 2)
+        y0 = np.minimum(sy.astype(np.int32), height - 2)
+        fx = (sx - x0)[..., None]
+        fy = (sy - y0)[..., None]
+        base = y0 * width + x0
+        top = pixels[base] * (1 - fx) + pixels[base + 1] * fx
+        bottom = pixels[base + width] * (1 - fx) + pixels[base + width + 1] * fx
+        warped = top * (1 - fy) + bottom * fy
+        output[start:start + sub_batch] = np.clip(warped + 0.5, 0, 255).reshape(-1, height, width, channels)
+    return output
+
+
+def load_image_array(img_path):
+    """Decode an image file into an (h, w, 3) uint8 array."""
+    with Image.open(img_path) as source_img:
+        return np.asarray(source_img.convert('RGB'))
+
+
+_worker_image = None
+_worker_params = None
+
+
+def _init_worker(img_path, params):
+    """Decode the source image once per worker process."""
+    global _worker_image, _worker_params
+    _worker_image = load_image_array(img_path)
+    _worker_params = params
+
+
+def _augment_batch(seed, count):
+    """Warp count augmented copies of the worker's image with an independent random stream."""
+    rng = np.random.default_rng(seed)
+    height, width, _ = _worker_image.shape
+    matrices = random_affine_matrices(rng, count, height, width, **_worker_params)
+    return warp_images(_worker_image, matrices)
+
+
+class FastImageAugmentor:
+    def __init__(self, img_path, save_dir='AugImage', rotation_range=10, width_shift_range=0.1,
+                 height_shift_range=0.1, shear_range=0.1, zoom_range=0.1, horizontal_flip=True):
+        self.img_path = img_path
+        self.save_dir = save_dir
+        self.params = dict(rotation_range=rotation_range, width_shift_range=width_shift_range,
+                           height_shift_range=height_shift_range, shear_range=shear_range,
+                           zoom_range=zoom_range, horizontal_flip=horizontal_flip)
+        self._create_save_dir()
+
+    def _create_save_dir(self):
+        """Create the directory for saving augmented images if it doesn't exist."""
+        if not os.path.exists(self.save_dir):
+            os.makedirs(self.save_dir)
+
+    def _writer(self, pending, save_format, quality, errors):
+        """Encode and write images from the queue until a None sentinel arrives, recording any failure."""
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            if errors:                                                              # After a failure, only drain the queue
+                continue
+            path, array = item
+            try:
+                Image.fromarray(array).save(path, format=save_format, quality=quality)
+            except Exception as error:
+                errors.append(error)
+
+    @staticmethod
+    def _put(pending, item, writers):
+        """Put item on the queue, giving up if no writer thread is left to consume it."""
+        while True:
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if not any(writer.is_alive() for writer in writers):
+                    return False
+
+    def augment_and_save_images(self, num_images=50, batch_size=32, num_workers=None, num_writers=4,
+                                save_prefix='new_image', save_format='jpeg', quality=90, seed=None):
+        """Generate num_images augmented images in parallel batches and save them asynchronously."""
+        if not os.path.exists(self.img_path):
+            print(f"Error: The image at path '{self.img_path}' was not found.")
+            return
+
+        counts = [min(batch_size, num_images - start) for start in range(0, num_images, batch_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(counts))                     # One independent stream per batch
+        num_workers = num_workers or os.cpu_count() or 1
+        pending = queue.Queue(maxsize=4 * batch_size)                               # Bounded, so warping cannot outrun the disk
+        errors = []
+        writers = [threading.Thread(target=self._writer, args=(pending, save_format, quality, errors))
+                   for _ in range(num_writers)]
+        for writer in writers:
+            writer.start()
+
+        def hand_over(batch, index):
+            for array in batch:
+                if errors:
+                    raise errors[0]
+                path = os.path.join(self.save_dir, f"{save_prefix}_{index}.{save_format}")
+                if not self._put(pending, (path, array), writers):
+                    raise RuntimeError("All writer threads have stopped.")
+                index += 1
+            return index
+
+        try:
+            with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker,
+                                     initargs=(self.img_path, self.params)) as executor:
+                index = 0
+                batches = []
+                for batch_seed, count in zip(seeds, counts):
+                    batches.append(executor.submit(_augment_batch, batch_seed, count))
+                    if len(batches) >= 2 * num_workers:                             # Bound the number of batches held in memory
+                        index = hand_over(batches.pop(0).result(), index)
+                for future in batches:
+                    index = hand_over(future.result(), index)
+        finally:
+            for _ in writers:
+                self._put(pending, None, writers)
+            for writer in writers:
+                writer.join()
+        if errors:
+            raise errors[0]
+        print(f"{num_images} augmented images have been saved to '{self.save_dir}'.")
+
+
+class AugmentedDataset:
+    def __init__(self, img_paths, variants_per_image=50, seed=0, cache_size=32, **params):
+        self.img_paths = list(img_paths)
+        self.variants_per_image = variants_per_image
+        self.seed = seed
+        self.params = params
+        self._load = functools.lru_cache(maxsize=cache_size)(load_image_array)     # Decode each source image once
+
+    def __len__(self):
+        """Number of samples in one epoch; any non-negative index is still valid."""
+        return len(self.img_paths) * self.variants_per_image
+
+    def _matrix(self, index, height, width):
+        """Derive the transform of a sample from (seed, index) only, so it never depends on access order."""
+        rng = np.random.default_rng([self.seed, index])
+        return random_affine_matrices(rng, 1, height, width, **self.params)[0]
+
+    def __getitem__(self, index):
+        if index < 0:
+            raise IndexError("Dataset indices must be non-negative.")
+        image = self._load(self.img_paths[index % len(self.img_paths)])
+        return warp_images(image, self._matrix(index, *image.shape[:2])[None])[0]
+
+    def get_batch(self, indices):
+        """Return the samples at indices, warping all samples of the same source image in one pass."""
+        indices = np.asarray(indices)
+        sources = indices % len(self.img_paths)
+        batch = [None] * len(indices)
+        for source in np.unique(sources):
+            positions = np.flatnonzero(sources == source)
+            image = self._load(self.img_paths[source])
+            matrices = np.array([self._matrix(int(indices[k]), *image.shape[:2]) for k in positions])
+            for k, warped in zip(positions, warp_images(image, matrices)):
+                batch[k] = warped
+        shapes = {sample.shape for sample in batch}
+        return np.stack(batch) if len(shapes) == 1 else batch
+
+    def iter_batches(self, batch_size=32, shuffle=False, prefetch=2, epoch=0):
+        """Iterate over one epoch in batches, preparing up to prefetch batches ahead on a thread pool."""
+        order = np.arange(len(self))
+        if shuffle:
+            np.random.default_rng([self.seed, epoch]).shuffle(order)
+        chunks = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = [executor.submit(self.get_batch, chunk) for chunk in chunks[:prefetch]]
+            next_chunk = len(pending)
+            while pending:
+                batch = pending.pop(0).result()
+                if next_chunk < len(chunks):
+                    pending.append(executor.submit(self.get_batch, chunks[next_chunk]))
+                    next_chunk += 1
+                yield batch
+
+
+def main():
+    augmentor = FastImageAugmentor(img_path='Test_Image.jpg', save_dir='FastAugImage')
+    augmentor.augment_and_save_images(num_images=50, seed=1)
+
+    dataset = AugmentedDataset(['Test_Image.jpg'], variants_per_image=50, seed=1)   # The same kind of samples, without files
+    print(f"Virtual dataset with {len(dataset)} samples; sample 7 has shape {dataset[7].shape}.")
+    print(f"Sample 7 is reproducible: {np.array_equal(dataset[7], dataset.get_batch([3, 7])[1])}")
+    for batch in dataset.iter_batches(batch_size=16, shuffle=True):
+        print(f"  batch of shape {batch.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,12 @@
 #       comparison of different distributions. The histograms are plotted in multiple figures if            *
 #       there are more than three distributions to ensure clarity.                                          *
 #                                                                                                           *
+#       The BinnedKDE class is a fast kernel density estimator for large samples. Each sample is linearly   *
+#       binned onto a common grid in chunks (O(n)), the bandwidth is selected from the binned data (Scott's *
+#       or Silverman's rule), and the binned counts of all distributions are convolved with their Gaussian  *
+#       kernels by one batched FFT (O(g log g) for a grid of g points). plot_distributions_fast uses it to  *
+#       draw the histograms and KDE curves of 10^7-sample distributions.                                    *
+#                                                                                                           *
 # ***********************************************************************************************************
 
 
@@ -21,6 +27,66 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 
+class BinnedKDE:
+    def __init__(self, grid_size=2**14, bw_method='scott', cut=3, chunk_size=2**20):
+        """
+        Gaussian KDE evaluated on a regular grid of grid_size points, extended cut
+        bandwidths beyond the data on both sides.
+        """
+
+        if bw_method not in ('scott', 'silverman'):
+            raise ValueError("bw_method must be 'scott' or 'silverman'.")
+        self.grid_size = grid_size
+        self.bw_method = bw_method
+        self.cut = cut
+        self.chunk_size = chunk_size
+
+    def _linear_binning(self, sample, lo, delta):
+        """Split the unit weight of each point between its two neighbouring grid points."""
+        counts = np.zeros(self.grid_size)
+        for start in range(0, len(sample), self.chunk_size):
+            position = (sample[start:start + self.chunk_size] - lo) / delta
+            left = np.clip(np.floor(position).astype(np.int64), 0, self.grid_size - 2)
+            right_weight = position - left
+            counts += np.bincount(left, weights=1 - right_weight, minlength=self.grid_size)
+            counts += np.bincount(left + 1, weights=right_weight, minlength=self.grid_size)
+        return counts
+
+    def _bandwidths(self, grid, counts):
+        """Select one bandwidth per row of binned counts."""
+        n = counts.sum(axis=1)
+        mean = counts @ grid / n
+        std = np.sqrt(np.sum(counts * (grid - mean[:, None]) ** 2, axis=1) / n)
+        if self.bw_method == 'scott':
+            return std * n ** (-1 / 5)
+        cumulative = np.cumsum(counts, axis=1)
+        iqr = np.array([np.diff(np.interp([0.25 * total, 0.75 * total], cdf, grid))[0]
+                        for total, cdf in zip(n, cumulative)])
+        return 0.9 * np.minimum(std, iqr / 1.34) * n ** (-1 / 5)
+
+    def evaluate(self, samples):
+        """Return the common grid, the (k, grid_size) densities and the k bandwidths of k samples."""
+        pilot = max(np.std(sample) * len(sample) ** (-1 / 5) for sample in samples)   # Pilot bandwidth sets the grid padding
+        lo = min(np.min(sample) for sample in samples) - self.cut * pilot
+        hi = max(np.max(sample) for sample in samples) + self.cut * pilot
+        grid = np.linspace(lo, hi, self.grid_size)
+        delta = grid[1] - grid[0]
+
+        counts = np.array([self._linear_binning(sample, lo, delta) for sample in samples])
+        bandwidths = self._bandwidths(grid, counts)
+
+        half_width = int(min(self.grid_size - 1, np.ceil(6 * bandwidths.max() / delta)))
+        fft_size = 1 << int(np.ceil(np.log2(self.grid_size + half_width)))
+        offsets = np.arange(-half_width, half_width + 1) * delta
+        kernels = np.exp(-0.5 * (offsets / bandwidths[:, None]) ** 2) / (bandwidths[:, None] * np.sqrt(2 * np.pi))
+        wrapped = np.zeros((len(samples), fft_size))
+        wrapped[:, :half_width + 1] = kernels[:, half_width:]                          # Non-negative offsets at the start,
+        wrapped[:, fft_size - half_width:] = kernels[:, :half_width]                   # negative offsets wrapped to the end
+        spectrum = np.fft.rfft(counts, fft_size, axis=1) * np.fft.rfft(wrapped, axis=1)
+        densities = np.fft.irfft(spectrum, fft_size, axis=1)[:, :self.grid_size] / counts.sum(axis=1)[:, None]
+        return grid, np.maximum(densities, 0), bandwidths
+
+
 class NormalDistributionPlotter:
     def __init__(self, params_list):
         """
@@ -31,12 +97,12 @@ class NormalDistributionPlotter:
         self.params_list = params_list
         self.data = []
 
-    def generate_data(self):
+    def generate_data(self, num_samples=1000):
         """Generate normal distribution data based on provided parameters."""
 
         self.data = []
         for mu, sigma, _ in self.params_list:
-            distribution = np.random.normal(mu, sigma, 1000)
+            distribution = np.random.normal(mu, sigma, num_samples)
             self.data.append(distribution)
     
     def plot_distributions(self):
@@ -53,6 +119,22 @@ class NormalDistributionPlotter:
         plt.legend()
         plt.show()
 
+    def plot_distributions_fast(self, bins=50, kde=None):
+        """Plot histograms of the generated distributions with a binned FFT KDE."""
+
+        kde = kde or BinnedKDE()
+        grid, densities, _ = kde.evaluate(self.data)                                   # All distributions in one batched pass
+        plt.figure(figsize=(12, 8))
+        for i, (distribution, density, (_, _, color)) in enumerate(zip(self.data, densities, self.params_list)):
+            if i >= 3:
+                plt.figure(figsize=(12, 8))
+            heights, edges = np.histogram(distribution, bins=bins, density=True)
+            plt.stairs(heights, edges, fill=True, alpha=0.4, color=color, label=f'Distribution {i+1}')
+            plt.plot(grid, density, color=color)
+
+        plt.legend()
+        plt.show()
+
 def main():
     params_list = [                                                           # Parameters for each normal distribution (mu, sigma, color)
         (5, 2, 'g'),
@@ -66,5 +148,9 @@ def main():
     plotter.generate_data()                                                   # Generate the data and plot the distributions
     plotter.plot_distributions()
 
+    large_plotter = NormalDistributionPlotter(params_list)                    # 10^7 samples per distribution with the binned KDE
+    large_plotter.generate_data(num_samples=10**7)
+    large_plotter.plot_distributions_fast()
+
 if __name__ == "__main__":
     main()
@@ -11,13 +11,30 @@
 #       and statistical power. This can be useful for planning experiments and determining appropriate          *
 #       sample sizes for reliable results.                                                                      *
 #                                                                                                               *
+#       For study-design tables, power_grid evaluates the power of the two-sided one-sample t-test over the     *
+#       whole broadcast grid of effect sizes, sample sizes and alphas with vectorized noncentral-t distribution *
+#       functions, and sample_size_grid inverts it for the sample size with a vectorized Illinois (regula       *
+#       falsi) bracketing solver. Results are memoized per grid point, so repeated or overlapping sub-grids are *
+#       only computed once, and both methods return a pandas Series labelled by a MultiIndex over the grid      *
+#       axes.                                                                                                   *
+#                                                                                                               *
+#       The SimulatedPowerAnalysis class estimates the power by simulation, for non-normal data and for tests   *
+#       that have no closed-form power function. A generator draws thousands of synthetic datasets at once as a *
+#       3-D array (replicate x group x n), and a vectorized test returns one p-value per replicate. Replicates  *
+#       are sharded across worker processes with independent seeds, and the simulation stops as soon as the     *
+#       Wilson confidence interval of the estimated power is narrower than the requested half-width.            *
+#                                                                                                               *
 # ***************************************************************************************************************
 
 
 
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 import statsmodels.stats.power as ssp
+from scipy import stats
 
 
 class StatisticalPowerAnalysis:
@@ -29,6 +46,8 @@ class StatisticalPowerAnalysis:
         self.alpha = alpha
         self.power = power
         self.stat_power = ssp.TTestPower()
+        self._power_cache = {}                                                      # (effect size, nobs, alpha) -> power
+        self._nobs_cache = {}                                                       # (effect size, alpha, power) -> nobs
 
     def calculate_sample_size(self):
         """
@@ -59,6 +78,181 @@ class StatisticalPowerAnalysis:
         plt.show()
         plt.close(fig)
 
+    @staticmethod
+    def _vectorized_power(effect_size, nobs, alpha):
+        """
+            Power of the two-sided one-sample t-test, element-wise over broadcast arrays.
+        """
+        df = nobs - 1
+        noncentrality = np.abs(effect_size) * np.sqrt(nobs)
+        critical = stats.t.isf(alpha / 2, df)
+        lower_tail = np.nan_to_num(stats.nct.cdf(-critical, df, noncentrality), nan=0.0)  # Negligible, but scipy may return NaN
+        return stats.nct.sf(critical, df, noncentrality) + lower_tail
+
+    def _vectorized_sample_size(self, effect_size, alpha, power, tol=1e-8, power_tol=1e-13, max_iter=200):
+        """
+            Solve power(nobs) = power for nobs element-wise with a bracketing Illinois solver.
+        """
+        effect_size, alpha, power = np.broadcast_arrays(effect_size, alpha, power)
+        solvable = (effect_size != 0) & (power > alpha) & (power < 1)
+        lo = np.full(effect_size.shape, 2.0)
+        hi = np.full(effect_size.shape, 16.0)
+        residual = lambda n, mask: self._vectorized_power(effect_size[mask], n, alpha[mask]) - power[mask]
+
+        f_lo = np.where(solvable, residual(lo, np.full(lo.shape, True)), 0.0)
+        solvable &= f_lo < 0                                                        # Targets reached below 2 observations are left as NaN
+        f_hi = np.where(solvable, residual(hi, np.full(hi.shape, True)), 0.0)
+        growing = solvable & (f_hi < 0)
+        while growing.any():                                                        # Double the upper bracket until it contains the root
+            hi[growing] *= 2
+            f_hi[growing] = residual(hi[growing], growing)
+            growing &= (f_hi < 0) & (hi < 1e9)
+
+        active = solvable & (f_hi >= 0)
+        root = np.full(effect_size.shape, np.nan)
+        side = np.zeros(effect_size.shape, dtype=int)
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            a, b, fa, fb = lo[active], hi[active], f_lo[active], f_hi[active]
+            c = b - fb * (b - a) / (fb - fa)
+            fc = residual(c, active)
+            failed = ~np.isfinite(fc)
+            if failed.any():                                                        # Fall back to a bisection step
+                c[failed] = (a[failed] + b[failed]) / 2
+                retry = active.copy()
+                retry[active] = failed
+                fc[failed] = residual(c[failed], retry)
+                failed = ~np.isfinite(fc)
+            done = (np.abs(fc) < power_tol) | (b - a < tol * b)                         # The power curve is flat near 1
+            root[active] = np.where(done & ~failed, c, np.nan)
+            done |= failed                                                          # Failed points stop with NaN and keep their bracket
+
+            left = fc < 0                                                          # The root lies in [c, b]
+            previous_side = side[active]
+            new_a, new_fa = np.where(left, c, a), np.where(left, fc, fa)
+            new_b, new_fb = np.where(left, b, c), np.where(left, fb, fc)
+            new_fb = np.where(left & (previous_side == 1), new_fb / 2, new_fb)      # Illinois step: halve the stale endpoint
+            new_fa = np.where(~left & (previous_side == -1), new_fa / 2, new_fa)
+            new_a, new_fa = np.where(failed, a, new_a), np.where(failed, fa, new_fa)
+            new_b, new_fb = np.where(failed, b, new_b), np.where(failed, fb, new_fb)
+            lo[active], f_lo[active], hi[active], f_hi[active] = new_a, new_fa, new_b, new_fb
+            side[active] = np.where(left, 1, -1)
+            still = active.copy()
+            still[active] = ~done
+            active = still
+        return root
+
+    @staticmethod
+    def _memoized(cache, func, *columns):
+        """
+            Evaluate func only on the grid points missing from cache, then read every point from it.
+        """
+        keys = list(zip(*(column.tolist() for column in columns)))
+        missing = np.array([i for i, key in enumerate(keys) if key not in cache], dtype=int)
+        if len(missing) > 0:
+            values = func(*(column[missing] for column in columns))
+            cache.update(zip((keys[i] for i in missing), values.tolist()))
+        return np.array([cache[key] for key in keys])
+
+    def power_grid(self, effect_sizes, sample_sizes, alphas=None):
+        """
+            Calculate the power over every combination of effect size, sample size and alpha.
+        """
+        axes = [np.atleast_1d(effect_sizes).astype(float), np.atleast_1d(sample_sizes).astype(float),
+                np.atleast_1d(self.alpha if alphas is None else alphas).astype(float)]
+        columns = [grid.ravel() for grid in np.meshgrid(*axes, indexing='ij')]
+        power = self._memoized(self._power_cache, self._vectorized_power, *columns)
+        index = pd.MultiIndex.from_product(axes, names=['effect_size', 'nobs', 'alpha'])
+        return pd.Series(power, index=index, name='power')
+
+    def sample_size_grid(self, effect_sizes, powers=None, alphas=None):
+        """
+            Calculate the required sample size over every combination of effect size, power and alpha.
+        """
+        axes = [np.atleast_1d(effect_sizes).astype(float), np.atleast_1d(self.power if powers is None else powers).astype(float),
+                np.atleast_1d(self.alpha if alphas is None else alphas).astype(float)]
+        effect, power, alpha = (grid.ravel() for grid in np.meshgrid(*axes, indexing='ij'))
+        nobs = self._memoized(self._nobs_cache, lambda e, a, p: self._vectorized_sample_size(e, a, p), effect, alpha, power)
+        index = pd.MultiIndex.from_product(axes, names=['effect_size', 'power', 'alpha'])
+        return pd.Series(nobs, index=index, name='nobs')
+
+
+def _count_rejections(generate, test, alpha, replicates, seed):
+    """
+        Simulate one shard of replicates and count how many of them reject the null hypothesis.
+    """
+    rng = np.random.default_rng(seed)
+    p_values = test(generate(rng, replicates))
+    return int(np.count_nonzero(p_values < alpha))
+
+
+class SimulatedPowerAnalysis:
+    def __init__(self, generate, test, alpha=0.05, shard_size=2000, num_workers=1, seed=None):
+        """
+            generate(rng, replicates) returns an array of shape (replicates, groups, n), and
+            test(data) returns one p-value per replicate. Both must be picklable (module-level
+            functions or functools.partial objects) to run in the worker processes.
+        """
+        self.generate = generate
+        self.test = test
+        self.alpha = alpha
+        self.shard_size = shard_size
+        self.num_workers = num_workers
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+    @staticmethod
+    def wilson_interval(rejections, replicates, confidence=0.95):
+        """
+            Wilson score interval for a binomial proportion.
+        """
+        z = stats.norm.isf((1 - confidence) / 2)
+        p = rejections / replicates
+        center = (p + z**2 / (2 * replicates)) / (1 + z**2 / replicates)
+        half_width = z * np.sqrt(p * (1 - p) / replicates + z**2 / (4 * replicates**2)) / (1 + z**2 / replicates)
+        return center - half_width, center + half_width
+
+    def estimate_power(self, target_half_width=0.01, confidence=0.95, max_replicates=10**6):
+        """
+            Simulate rounds of shards until the confidence interval of the power is tight enough.
+        """
+        rejections, replicates = 0, 0
+        interval = (0.0, 1.0)
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            while replicates < max_replicates:
+                remaining = max_replicates - replicates
+                sizes = [min(self.shard_size, remaining - start)
+                         for start in range(0, min(remaining, self.num_workers * self.shard_size), self.shard_size)]
+                seeds = self.seed_sequence.spawn(len(sizes))                        # Fresh independent streams every round
+                rejections += sum(executor.map(_count_rejections, [self.generate] * len(sizes), [self.test] * len(sizes),
+                                               [self.alpha] * len(sizes), sizes, seeds))
+                replicates += sum(sizes)
+                interval = self.wilson_interval(rejections, replicates, confidence)
+                if (interval[1] - interval[0]) / 2 <= target_half_width:
+                    break
+        power = rejections / replicates
+        print('---> Simulated Power = {:.4f}  ({:.0%} CI {:.4f} - {:.4f}, {} replicates)'.format(
+            power, confidence, interval[0], interval[1], replicates))
+        return power, interval, replicates
+
+
+def lognormal_groups(rng, replicates, n=30, sigma=1.0, shift=0.5):
+    """
+        Two groups of skewed (lognormal) data, the second one shifted by shift in log scale.
+    """
+    data = rng.lognormal(0.0, sigma, (replicates, 2, n))
+    data[:, 1] *= np.exp(shift)
+    return data
+
+
+def welch_t_test(data):
+    return stats.ttest_ind(data[:, 0], data[:, 1], axis=1, equal_var=False).pvalue
+
+
+def mann_whitney_test(data):
+    return stats.mannwhitneyu(data[:, 0], data[:, 1], axis=1).pvalue
+
+
 def main():
     analysis = StatisticalPowerAnalysis(effect_size=0.5, alpha=0.05, power=0.8)             # Initialize the class with default effect size, alpha, and power
     print("\n\n", "*" * 50, "\n")
@@ -69,6 +263,18 @@ def main():
     sample_sizes = np.array(range(5, 500))
     analysis.plot_power_curve(effect_sizes, sample_sizes)                                   # Plot the power curve
 
+    sample_size_table = analysis.sample_size_grid(np.arange(0.1, 1.05, 0.1), powers=[0.8, 0.9], alphas=[0.01, 0.05])
+    print("\n---> Required sample sizes (rows: effect size, columns: power and alpha)\n")
+    print(sample_size_table.unstack(['power', 'alpha']).round(2))
+    power_table = analysis.power_grid(effect_sizes, sample_sizes)                           # The whole power surface at once
+    print(f"\n---> Power surface with {power_table.size} grid points computed in one vectorized call\n")
+
+    generate = partial(lognormal_groups, n=30, shift=0.5)                                   # Skewed data, where the t-test is only approximate
+    for name, test in [('Welch t-test', welch_t_test), ('Mann-Whitney U test', mann_whitney_test)]:
+        print(f"\n---> {name} on lognormal groups")
+        SimulatedPowerAnalysis(generate, test, num_workers=4, seed=1).estimate_power(target_half_width=0.005)
+    print()
+
 
 if __name__ == "__main__":
     main()
@@ -9,7 +9,8 @@
 #                                                                                                           *
 #       Main Features:                                                                                      *
 #       - `generate_data`: Generates N random numbers uniformly distributed between a and b.                *
-#       - `plot_data`: Plots the generated random numbers as a line plot.                                   *
+#       - `plot_data`: Plots the generated random numbers as a line plot. Series longer than max_points     *
+#         are reduced first with the min/max-per-bucket downsampling of the shared renderer.                *
 #       - `plot_histogram`: Plots a histogram of the generated random numbers to visualize their            *
 #         distribution.                                                                                     *
 #                                                                                                           *
@@ -23,10 +24,16 @@
 
 
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Downsampling Renderer'))
+from downsampling_renderer import plot_downsampled
+
+
 class RandomPlotter:
     def __init__(self, a, b, N):
         self.a = a
@@ -38,9 +45,12 @@ class RandomPlotter:
         """Generate N random numbers uniformly distributed between a and b."""
         self.data = np.random.uniform(self.a, self.b, self.N)
 
-    def plot_data(self):
-        """Plot the generated random data."""
-        plt.plot(self.data)
+    def plot_data(self, max_points=4000):
+        """Plot the generated random data, downsampled to about max_points points if it is longer."""
+        if len(self.data) > max_points:
+            plot_downsampled(self.data, num_points=max_points)
+        else:
+            plt.plot(self.data)
         plt.show()
 
     def plot_histogram(self):
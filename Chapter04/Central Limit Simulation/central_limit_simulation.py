@@ -13,24 +13,48 @@
 #         calculates the mean of each sample, and stores these means.                                         *
 #       - `plot_sample_means_histogram`: Plots a histogram of the sample means, allowing visualization        *
 #         of the distribution of sample means after multiple sampling.                                        *
+#       - `draw_indices`: Draws a whole (num_samples x sample_size) matrix of without-replacement indices at  *
+#         once, with random keys and `argpartition` for small populations or a vectorized Floyd algorithm     *
+#         for large ones.                                                                                     *
+#       - `sample_statistics`: Computes any statistic that reduces along an axis (mean, variance,             *
+#         median, ...) for every sample in batches. The population may be a memory-mapped array,              *
+#         such as the one written by `create_population_memmap`, so CLT studies can run on                    *
+#         populations of 10^9 values.                                                                         *
 #                                                                                                             *
 # *************************************************************************************************************
 
 
 
+import os
 import random
+import tempfile
 import numpy as np
 import matplotlib.pyplot as plt
 
 
+def create_population_memmap(path, N, a=1, b=100, chunk_size=2**24, seed=None):
+    """Write a uniform population of N float64 values to a memory-mapped file, one chunk at a time."""
+    rng = np.random.default_rng(seed)
+    population = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(N,))
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+        population[start:stop] = rng.uniform(a, b, stop - start)
+    population.flush()
+    return np.load(path, mmap_mode='r')
+
+
 class SamplingSimulation:
-    def __init__(self, a=1, b=100, N=10000, sample_size=100, num_samples=1000):
+    def __init__(self, a=1, b=100, N=10000, sample_size=100, num_samples=1000, population=None):
         self.a = a
         self.b = b
-        self.N = N
         self.sample_size = sample_size
         self.num_samples = num_samples
-        self.DataPop = list(np.random.uniform(self.a, self.b, self.N))
+        if population is None:
+            self.N = N
+            self.DataPop = list(np.random.uniform(self.a, self.b, self.N))
+        else:                                                                     # An array or a memory-mapped array, never copied
+            self.N = len(population)
+            self.DataPop = population
         self.SamplesMeans = []
 
     def plot_population_histogram(self):
@@ -44,6 +68,41 @@ class SamplingSimulation:
             DataExtractedMean = np.mean(DataExtracted)
             self.SamplesMeans.append(DataExtractedMean)
 
+    def draw_indices(self, num_samples, rng, method='auto'):
+        """Return a (num_samples, sample_size) matrix whose rows are draws without replacement from range(N)."""
+        k = self.sample_size
+        if k > self.N:
+            raise ValueError("sample_size cannot be larger than the population.")
+        if method == 'auto':
+            method = 'keys' if self.N <= 8 * k else 'floyd'
+        if method == 'keys':
+            keys = rng.random((num_samples, self.N))                              # The k smallest random keys of each row
+            return np.argpartition(keys, k - 1, axis=1)[:, :k] if k < self.N else np.argsort(keys, axis=1)
+        if method != 'floyd':
+            raise ValueError("method must be 'auto', 'keys' or 'floyd'.")
+
+        selected = np.empty((num_samples, k), dtype=np.int64)                     # Floyd's algorithm, one column per step
+        for i, j in enumerate(range(self.N - k, self.N)):
+            t = rng.integers(0, j + 1, size=num_samples)
+            taken = (selected[:, :i] == t[:, None]).any(axis=1)
+            selected[:, i] = np.where(taken, j, t)
+        return selected
+
+    def sample_statistics(self, statistic=np.mean, num_samples=None, batch_size=10000, seed=None, method='auto'):
+        """Compute statistic(values, axis=1) for num_samples samples, drawing the indices batch by batch."""
+        num_samples = self.num_samples if num_samples is None else num_samples
+        rng = np.random.default_rng(seed)
+        population = self.DataPop if isinstance(self.DataPop, np.ndarray) else np.asarray(self.DataPop)
+        results = []
+        for start in range(0, num_samples, batch_size):
+            indices = self.draw_indices(min(batch_size, num_samples - start), rng, method)
+            indices.sort(axis=1)                                                  # Ordered reads are kinder to memory-mapped files
+            results.append(statistic(population[indices], axis=1))
+        return np.concatenate(results)
+
+    def extract_samples_and_calculate_means_batched(self, batch_size=10000, seed=None):
+        self.SamplesMeans = self.sample_statistics(np.mean, batch_size=batch_size, seed=seed)
+
     def plot_sample_means_histogram(self):
         plt.hist(self.SamplesMeans, density=True, histtype='stepfilled', alpha=0.2)
         plt.title('Sample Means Histogram')
@@ -55,6 +114,19 @@ def main():
     simulation.extract_samples_and_calculate_means()
     simulation.plot_sample_means_histogram()
 
+    simulation.extract_samples_and_calculate_means_batched(seed=1)                # The same study in a few vectorized calls
+    simulation.plot_sample_means_histogram()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'clt_population.npy')
+        population = create_population_memmap(path, N=10**7, seed=1)              # 10^9 values work the same way, given the disk space
+        study = SamplingSimulation(sample_size=100, num_samples=100000, population=population)
+        variances = study.sample_statistics(np.var, seed=2)
+        means = study.sample_statistics(np.mean, seed=2)
+        del study, population                                                     # Release the memory map before the file is removed
+    print(f"\n---> {len(means)} samples: mean of means = {means.mean():.4f}, "
+          f"std of means = {means.std():.4f}, mean variance = {variances.mean():.2f}\n")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,13 +6,39 @@
 #       integral of a function over a given range. The Monte Carlo method is a statistical technique that       *
 #       relies on random sampling to approximate complex integrals.                                             *
 #                                                                                                               *
+#       The vectorized mode evaluates f on NumPy chunks instead of one Python call per point.                   *
+#       find_ymin_ymax_vectorized scans the range in chunks, and integrate_vectorized counts the hits of each   *
+#       chunk with an array reduction and returns the estimate together with its standard error. Rather than    *
+#       storing every point, it keeps a fixed-size uniform reservoir sample of them for plot, so that even 10^9 *
+#       samples run in constant memory.                                                                         *
+#                                                                                                               *
+#       The estimate method adds lower-variance estimators, all vectorized and accumulated chunk by chunk:      *
+#       sample-mean, stratified sampling, antithetic variates, control variates, importance sampling with a     *
+#       user proposal, and scrambled Sobol or Halton quasi-Monte Carlo, whose error bar comes from independent  *
+#       randomized replicates. benchmark_estimators doubles the number of samples of each estimator until its   *
+#       standard error meets a common target, and reports the samples and time each one needs compared with     *
+#       hit-or-miss.                                                                                            *
+#                                                                                                               *
+#       The VegasIntegrator class extends the same ideas to d-dimensional integrals over hyperrectangles, with  *
+#       no bounding box to scan. Following the VEGAS algorithm, it keeps a separable adaptive grid per          *
+#       dimension and samples through it, so points concentrate where |f| is large. After each iteration, the   *
+#       bins are resized to equalise their share of f^2, and the iteration estimates are combined by inverse-   *
+#       variance weighting with a chi^2 consistency check. The evaluations are batched in shards of fixed size  *
+#       that can run on worker processes, each shard with its own deterministic seed, so the result does not    *
+#       depend on the number of workers.                                                                        *
+#                                                                                                               *
 # ***************************************************************************************************************
 
 
 
+import time
 import random
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.stats import qmc
+from scipy.special import erf
 
 
 class MonteCarloIntegrator:
@@ -58,6 +84,179 @@ class MonteCarloIntegrator:
 
         return M / self.num_samples * A                                                 # Calculate the numerical integral
 
+    def find_ymin_ymax_vectorized(self, chunk_size=2**20):
+        """Find the minimum and maximum values of f(x) on the same grid, evaluating f on NumPy chunks."""
+        for start in range(0, self.num_steps, chunk_size):
+            x = self.a + (self.b - self.a) * np.arange(start, min(start + chunk_size, self.num_steps)) / self.num_steps
+            y = self.f(x)
+            self.ymin = min(self.ymin, float(np.min(y)))
+            self.ymax = max(self.ymax, float(np.max(y)))
+
+    def integrate_vectorized(self, num_samples=None, chunk_size=2**20, max_points=10000, seed=None):
+        """Perform hit-or-miss Monte Carlo integration on chunks; return the integral and its standard error."""
+        num_samples = self.num_samples if num_samples is None else num_samples
+        rng = np.random.default_rng(seed)
+        A = (self.b - self.a) * (self.ymax - self.ymin)
+        M = 0
+        keys = np.empty(0)                                                              # Reservoir: the points with the smallest random keys
+        points = np.empty((0, 3))                                                       # Columns: x, y, hit
+
+        for start in range(0, num_samples, chunk_size):
+            count = min(chunk_size, num_samples - start)
+            x = self.a + (self.b - self.a) * rng.random(count)
+            y = self.ymin + (self.ymax - self.ymin) * rng.random(count)
+            hit = y <= self.f(x)
+            M += int(np.count_nonzero(hit))
+
+            chunk_keys = rng.random(count)                                              # A uniform sample of all points seen so far
+            if count > max_points:
+                keep = np.argpartition(chunk_keys, max_points - 1)[:max_points]
+                chunk_keys, x, y, hit = chunk_keys[keep], x[keep], y[keep], hit[keep]
+            keys = np.concatenate((keys, chunk_keys))
+            points = np.concatenate((points, np.column_stack((x, y, hit))))
+            if len(keys) > max_points:
+                keep = np.argpartition(keys, max_points - 1)[:max_points]
+                keys, points = keys[keep], points[keep]
+
+        inside = points[:, 2].astype(bool)
+        self.XIntegral, self.YIntegral = points[inside, 0], points[inside, 1]
+        self.XRectangle, self.YRectangle = points[~inside, 0], points[~inside, 1]
+        p = M / num_samples
+        return p * A, A * np.sqrt(p * (1 - p) / num_samples)                            # Binomial standard error of the estimate
+
+    @staticmethod
+    def _chunked_mean(draw, num_values, chunk_size):
+        """Mean and standard error of num_values i.i.d. values produced by draw(count), one chunk at a time."""
+        total, total_sq = 0.0, 0.0
+        for start in range(0, num_values, chunk_size):
+            values = draw(min(chunk_size, num_values - start))
+            total += float(np.sum(values))
+            total_sq += float(np.sum(values * values))
+        mean = total / num_values
+        variance = max(total_sq / num_values - mean**2, 0.0) * num_values / max(num_values - 1, 1)
+        return mean, np.sqrt(variance / num_values)
+
+    def _sample_mean(self, rng, num_samples, chunk_size):
+        width = self.b - self.a
+        return self._chunked_mean(lambda n: width * self.f(self.a + width * rng.random(n)), num_samples, chunk_size)
+
+    def _stratified(self, rng, num_samples, chunk_size, points_per_stratum=2):
+        """One stratum per points_per_stratum samples; the variance is summed over the strata."""
+        num_strata = max(num_samples // points_per_stratum, 1)
+        h = (self.b - self.a) / num_strata
+        estimate, variance = 0.0, 0.0
+        step = max(chunk_size // points_per_stratum, 1)
+        for start in range(0, num_strata, step):
+            strata = np.arange(start, min(start + step, num_strata))[:, None]
+            y = self.f(self.a + h * (strata + rng.random((len(strata), points_per_stratum))))
+            estimate += h * float(np.sum(y.mean(axis=1)))
+            variance += h**2 * float(np.sum(y.var(axis=1, ddof=1))) / points_per_stratum
+        return estimate, np.sqrt(variance)
+
+    def _antithetic(self, rng, num_samples, chunk_size):
+        """Pair every x with a + b - x, so that monotone integrands get negatively correlated halves."""
+        width = self.b - self.a
+
+        def draw(n):
+            x = self.a + width * rng.random(n)
+            return width * (self.f(x) + self.f(self.a + self.b - x)) / 2
+
+        return self._chunked_mean(draw, max(num_samples // 2, 1), chunk_size)
+
+    def _control_variates(self, rng, num_samples, chunk_size, control=None):
+        """control = (g, integral of g over [a, b]); the default is g(x) = x. The optimal coefficient is estimated."""
+        g, g_integral = control or (lambda x: x, (self.b**2 - self.a**2) / 2)
+        width = self.b - self.a
+        sums = np.zeros(5)                                                              # Sums of f, g, f^2, g^2 and f*g
+        for start in range(0, num_samples, chunk_size):
+            x = self.a + width * rng.random(min(chunk_size, num_samples - start))
+            fx, gx = width * self.f(x), width * g(x)
+            sums += [np.sum(fx), np.sum(gx), np.sum(fx * fx), np.sum(gx * gx), np.sum(fx * gx)]
+        mean_f, mean_g = sums[:2] / num_samples
+        var_f = sums[2] / num_samples - mean_f**2
+        var_g = sums[3] / num_samples - mean_g**2
+        cov_fg = sums[4] / num_samples - mean_f * mean_g
+        beta = cov_fg / var_g if var_g > 0 else 0.0
+        residual_variance = max(var_f - 2 * beta * cov_fg + beta**2 * var_g, 0.0)
+        return float(mean_f - beta * (mean_g - g_integral)), np.sqrt(residual_variance / num_samples)
+
+    def _importance(self, rng, num_samples, chunk_size, proposal=None):
+        """proposal = (sample(rng, n), pdf(x)), a density that is positive wherever f is non-zero on [a, b]."""
+        if proposal is None:
+            raise ValueError("Importance sampling needs a proposal (sample, pdf).")
+        sample, pdf = proposal
+
+        def draw(n):
+            x = sample(rng, n)
+            return self.f(x) / pdf(x)
+
+        return self._chunked_mean(draw, num_samples, chunk_size)
+
+    def _quasi_monte_carlo(self, rng, num_samples, chunk_size, engine='sobol', replicates=16):
+        """Average independently scrambled low-discrepancy sequences; their spread gives the standard error."""
+        width = self.b - self.a
+        per_replicate = max(num_samples // replicates, 1)
+        if engine == 'sobol':
+            per_replicate = 2**int(np.log2(per_replicate))                              # Sobol points are balanced in powers of 2
+        chunk_size = 2**int(np.log2(chunk_size))
+        estimates = []
+        for _ in range(replicates):
+            if engine == 'sobol':
+                sampler = qmc.Sobol(d=1, scramble=True, seed=rng)
+            elif engine == 'halton':
+                sampler = qmc.Halton(d=1, scramble=True, seed=rng)
+            else:
+                raise ValueError("engine must be 'sobol' or 'halton'.")
+            total = 0.0
+            for start in range(0, per_replicate, chunk_size):
+                u = sampler.random(min(chunk_size, per_replicate - start))[:, 0]
+                total += float(np.sum(self.f(self.a + width * u)))
+            estimates.append(width * total / per_replicate)
+        return float(np.mean(estimates)), float(np.std(estimates, ddof=1) / np.sqrt(replicates))
+
+    def estimate(self, method='sample-mean', num_samples=None, seed=None, chunk_size=2**20, **options):
+        """Estimate the integral with the selected estimator; return the estimate and its standard error."""
+        num_samples = self.num_samples if num_samples is None else num_samples
+        if method == 'hit-or-miss':
+            if self.ymax < self.ymin:
+                self.find_ymin_ymax_vectorized()
+            return self.integrate_vectorized(num_samples, chunk_size=chunk_size, seed=seed, **options)
+        if method in ('sobol', 'halton'):
+            options['engine'] = method
+        estimators = {
+            'sample-mean': self._sample_mean,
+            'stratified': self._stratified,
+            'antithetic': self._antithetic,
+            'control-variates': self._control_variates,
+            'importance': self._importance,
+            'sobol': self._quasi_monte_carlo,
+            'halton': self._quasi_monte_carlo,
+        }
+        if method not in estimators:
+            raise ValueError(f"Unknown method '{method}'. Choose from {['hit-or-miss'] + list(estimators)}.")
+        return estimators[method](np.random.default_rng(seed), num_samples, chunk_size, **options)
+
+    def benchmark_estimators(self, methods, target_error=2e-3, start_samples=2**10, max_samples=2**30, seed=0):
+        """Double the samples of each estimator until its standard error reaches target_error."""
+        results = []
+        for method, options in methods.items():
+            n = start_samples
+            while True:
+                start = time.perf_counter()
+                value, error = self.estimate(method, num_samples=n, seed=seed, **options)
+                elapsed = time.perf_counter() - start
+                if error <= target_error or n >= max_samples:
+                    break
+                n *= 2
+            results.append((method, n, value, error, elapsed))
+
+        print(f"\n{'Estimator':<18}{'Samples':>14}{'Estimate':>12}{'Std error':>12}{'Seconds':>10}{'Speed-up':>10}")
+        baseline = {r[0]: r[4] for r in results}.get('hit-or-miss')
+        for method, n, value, error, elapsed in results:
+            speedup = f"{baseline / elapsed:.1f}x" if baseline else '-'
+            print(f"{method:<18}{n:>14,}{value:>12.6f}{error:>12.6f}{elapsed:>10.3f}{speedup:>10}")
+        return results
+
     def plot(self):
         """Plot the results of the Monte Carlo integration."""
         XLin = np.linspace(self.a, self.b)
@@ -70,6 +269,100 @@ class MonteCarloIntegrator:
         plt.title("Numerical Integration using Monte Carlo method")
         plt.show()
 
+def _vegas_shard(f, edges, lower, upper, count, seed, chunk_size):
+    """Sample count points through the VEGAS grid; return the sums of f*J, (f*J)^2 and the per-bin sums of (f*J)^2."""
+    rng = np.random.default_rng(seed)
+    dims, num_bins = edges.shape[0], edges.shape[1] - 1
+    widths = np.diff(edges, axis=1)
+    volume = np.prod(upper - lower)
+    total, total_sq = 0.0, 0.0
+    bin_sums = np.zeros((dims, num_bins))
+    for start in range(0, count, chunk_size):
+        n = min(chunk_size, count - start)
+        y = rng.random((n, dims)) * num_bins
+        bins = y.astype(np.int64)
+        dim_index = np.arange(dims)
+        u = edges[dim_index, bins] + (y - bins) * widths[dim_index, bins]             # Grid coordinates in [0, 1]^d
+        jacobian = volume * np.prod(num_bins * widths[dim_index, bins], axis=1)
+        values = f(lower + (upper - lower) * u) * jacobian
+        total += float(np.sum(values))
+        total_sq += float(np.sum(values * values))
+        for d in range(dims):
+            bin_sums[d] += np.bincount(bins[:, d], weights=values * values, minlength=num_bins)
+    return total, total_sq, bin_sums
+
+
+class VegasIntegrator:
+    def __init__(self, f, lower, upper, num_bins=50, alpha=1.5, shard_size=2**16, num_workers=1, seed=None):
+        """f maps an (n, d) array of points to n values; it must be picklable to use worker processes."""
+        self.f = f
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        if self.lower.shape != self.upper.shape or np.any(self.upper <= self.lower):
+            raise ValueError("lower and upper must have the same length, with lower < upper.")
+        self.dims = len(self.lower)
+        self.num_bins = num_bins
+        self.alpha = alpha                                                              # Damping of the grid refinement
+        self.shard_size = shard_size
+        self.num_workers = num_workers
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.edges = np.tile(np.linspace(0, 1, num_bins + 1), (self.dims, 1))           # Start from a uniform grid
+
+    def _run_iteration(self, num_evals, executor):
+        counts = [min(self.shard_size, num_evals - start) for start in range(0, num_evals, self.shard_size)]
+        seeds = self.seed_sequence.spawn(len(counts))                                   # Deterministic: one seed per shard, not per worker
+        args = ([self.f] * len(counts), [self.edges] * len(counts), [self.lower] * len(counts),
+                [self.upper] * len(counts), counts, seeds, [2**14] * len(counts))
+        results = list(executor.map(_vegas_shard, *args) if executor else map(_vegas_shard, *args))
+        total = sum(r[0] for r in results)
+        total_sq = sum(r[1] for r in results)
+        bin_sums = sum(r[2] for r in results)
+        mean = total / num_evals
+        variance = max(total_sq / num_evals - mean**2, 0.0) / (num_evals - 1)
+        return mean, variance, bin_sums
+
+    def _refine_grid(self, bin_sums):
+        """Resize the bins of every dimension so that each holds an equal share of the damped f^2 weights."""
+        for d in range(self.dims):
+            weights = bin_sums[d]
+            smoothed = np.convolve(np.pad(weights, 1, mode='edge'), np.ones(3) / 3, mode='valid')
+            if smoothed.sum() <= 0:
+                continue
+            r = smoothed / smoothed.sum()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                damped = np.where((r > 0) & (r < 1), ((1 - r) / np.log(1 / r)) ** self.alpha, r)
+            cumulative = np.concatenate(([0.0], np.cumsum(damped)))
+            targets = np.linspace(0, cumulative[-1], self.num_bins + 1)
+            self.edges[d] = np.interp(targets, cumulative, self.edges[d])              # Invert the cumulative weight
+
+    def integrate(self, num_evals=2**17, iterations=10, warmup=3):
+        """Adapt the grid for warmup iterations, then combine the remaining ones; return estimate, error and chi^2/dof."""
+        if iterations <= warmup:
+            raise ValueError("iterations must be greater than warmup.")
+        estimates, variances = [], []
+        executor = ProcessPoolExecutor(max_workers=self.num_workers) if self.num_workers > 1 else None
+        try:
+            for iteration in range(iterations):
+                mean, variance, bin_sums = self._run_iteration(num_evals, executor)
+                if iteration >= warmup:                                                 # Early, poorly adapted grids are discarded
+                    estimates.append(mean)
+                    variances.append(variance)
+                self._refine_grid(bin_sums)
+        finally:
+            if executor:
+                executor.shutdown()
+        weights = 1 / np.maximum(np.array(variances), np.finfo(float).tiny)
+        estimate = float(np.sum(weights * estimates) / np.sum(weights))
+        error = float(np.sqrt(1 / np.sum(weights)))
+        chi2_dof = float(np.sum(weights * (np.array(estimates) - estimate) ** 2) / max(len(estimates) - 1, 1))
+        return estimate, error, chi2_dof
+
+
+def gaussian_peak(x, width=0.1):
+    """A narrow Gaussian at the centre of the unit hypercube; its integral over [0, 1]^d is erf(0.5 / width)^d."""
+    return np.exp(-np.sum((x - 0.5) ** 2, axis=1) / width**2) / (width * np.sqrt(np.pi)) ** x.shape[1]
+
+
 def main():
     # Define the function and the limits of integration
     f = lambda x: x**2
@@ -85,6 +378,34 @@ def main():
     print(f"\n\n---> Numerical integration = {numerical_integral:.6f}\n")
     integrator.plot()
 
+    integrator = MonteCarloIntegrator(f, a, b, num_steps, num_samples)
+    integrator.find_ymin_ymax_vectorized()
+    for n in [10**6, 10**8, 10**9]:                                                    # Memory stays constant as n grows
+        numerical_integral, standard_error = integrator.integrate_vectorized(num_samples=n, seed=2)
+        print(f"---> Vectorized, n = {n:.0e}: {numerical_integral:.6f} +/- {standard_error:.6f}")
+    integrator.plot()
+
+    proposal = (lambda rng, n: b * np.sqrt(rng.random(n)), lambda x: 2 * x / b**2)   # Density proportional to x on [0, b]
+    methods = {
+        'hit-or-miss': {},
+        'sample-mean': {},
+        'stratified': {},
+        'antithetic': {},
+        'control-variates': {},
+        'importance': {'proposal': proposal},
+        'sobol': {},
+        'halton': {},
+    }
+    print("\n---> Samples and time needed by each estimator for the same standard error")
+    integrator.benchmark_estimators(methods, target_error=2e-3)
+
+    print()
+    for dims, width in [(5, 0.1), (10, 0.1), (20, 0.2)]:                                # Plain Monte Carlo almost never hits these peaks
+        vegas = VegasIntegrator(partial(gaussian_peak, width=width), np.zeros(dims), np.ones(dims), num_workers=4, seed=2)
+        estimate, error, chi2_dof = vegas.integrate(num_evals=2**17, iterations=15)
+        exact = erf(0.5 / width) ** dims
+        print(f"---> VEGAS, d = {dims:2d}: {estimate:.6f} +/- {error:.6f}  (exact {exact:.6f}, chi2/dof = {chi2_dof:.2f})")
+
 
 if __name__ == "__main__":
     main()
@@ -13,17 +13,41 @@
 #         and estimates Pi based on the ratio of points inside the circle to the total number of points.                        *
 #       - `plot_results`: Visualizes the estimation process by plotting points within the unit circle and square.               *
 #         A red curve represents the boundary of the unit circle.                                                               *
+#       - `estimate_pi_sharded`: Splits the samples into fixed-size shards run on a process pool, each with an                  *
+#         independent seeded stream. A shard counts the hits over float32 chunks with vectorized reductions and returns         *
+#         only its count, so memory stays constant, and the merged estimate comes with a normal confidence interval.            *
 #                                                                                                                               *
 # *******************************************************************************************************************************
 
 
 
 import math
+import time
 import random
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from scipy import stats
 import matplotlib.pyplot as plt
 
 
+def _count_shard(num_samples, seed, chunk_size):
+    """Count the points of one shard that fall inside the unit circle, using float32 chunks."""
+    rng = np.random.default_rng(seed)
+    x = np.empty(chunk_size, dtype=np.float32)
+    y = np.empty(chunk_size, dtype=np.float32)
+    hits = 0
+    for start in range(0, num_samples, chunk_size):
+        count = min(chunk_size, num_samples - start)
+        xs, ys = x[:count], y[:count]
+        rng.random(dtype=np.float32, out=xs)
+        rng.random(dtype=np.float32, out=ys)
+        np.multiply(xs, xs, out=xs)                                                     # Reuse the buffers: no allocation per chunk
+        np.multiply(ys, ys, out=ys)
+        np.add(xs, ys, out=xs)
+        hits += int(np.count_nonzero(xs <= 1))
+    return hits
+
+
 class MonteCarloPiEstimator:
     def __init__(self, num_samples):
         self.num_samples = num_samples
@@ -59,6 +83,17 @@ class MonteCarloPiEstimator:
         plt.title("Monte Carlo method for Pi estimation")
         plt.show()
 
+    def estimate_pi_sharded(self, num_workers=None, shard_size=10**8, chunk_size=2**20, seed=None, confidence=0.95):
+        """Estimate Pi on a process pool and return the estimate with its confidence interval."""
+        counts = [min(shard_size, self.num_samples - start) for start in range(0, self.num_samples, shard_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(counts))                         # One stream per shard, whatever the worker count
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            self.m = sum(executor.map(_count_shard, counts, seeds, [chunk_size] * len(counts)))
+        p = self.m / self.num_samples
+        half_width = stats.norm.isf((1 - confidence) / 2) * 4 * math.sqrt(p * (1 - p) / self.num_samples)
+        pi_estimate = 4 * p
+        return pi_estimate, (pi_estimate - half_width, pi_estimate + half_width)
+
 def main():
     num_samples = 10000
     estimator = MonteCarloPiEstimator(num_samples)
@@ -66,6 +101,14 @@ def main():
     print(f"\n\n---> N={num_samples} \n---> M={estimator.m} \n---> Pi={pi_estimate:.2f}\n")
     estimator.plot_results()
 
+    for num_samples in [10**7, 10**9]:                                                  # Use 10^11 samples for a full node benchmark
+        estimator = MonteCarloPiEstimator(num_samples)
+        start = time.perf_counter()
+        pi_estimate, (low, high) = estimator.estimate_pi_sharded(seed=1)
+        elapsed = time.perf_counter() - start
+        print(f"---> N={num_samples:.0e}  Pi={pi_estimate:.6f}  95% CI=({low:.6f}, {high:.6f})  "
+              f"{num_samples / elapsed / 1e6:.1f} M samples/s")
+
 
 if __name__ == "__main__":
     main()
@@ -12,6 +12,25 @@
 #         exceptions if any error occurs during function evaluation.                                                        *
 #       - `plot`: Generates a scatter matrix plot of the parameter values versus the function results to visualize          *
 #         relationships between parameters and the function output.                                                         *
+#       - `iter_grid_chunks`: Builds the Cartesian grid of any number of named parameter ranges lazily, one chunk of        *
+#         flat grid indices at a time, so the whole grid is never materialised.                                             *
+#       - `evaluate_grid`: Evaluates a vectorized function on each chunk through broadcasting and writes the results        *
+#         into a preallocated columnar array, optionally memory-mapped to a file, so grids of 10^8 points stay              *
+#         tractable. Functions that only accept scalars are detected on a few probe points and evaluated on a               *
+#         process pool instead, chunk by chunk.                                                                             *
+#       - `sobol_indices`: Global, variance-based sensitivity with first-order and total Sobol indices, estimated           *
+#         from a Saltelli design (N * (d + 2) evaluations) built on a scrambled Sobol sequence, with each parameter         *
+#         uniform between the smallest and the largest value of its range.                                                  *
+#       - `morris_screening`: Morris elementary effects (mu, mu* and sigma) from random one-at-a-time trajectories.         *
+#         Both methods batch the evaluations into vectorized calls spread over worker processes, and compute bootstrap      *
+#         confidence intervals by resampling the same evaluations, so 20+ parameters can be ranked with tens of             *
+#         thousands of evaluations instead of a full grid.                                                                  *
+#       - `EvaluationCache`: A persistent, content-addressed memoization cache of expensive model evaluations, kept in      *
+#         an SQLite file and keyed on a hash of the function identity and the parameter tuple. The identity covers the      *
+#         code, closure cells and referenced globals of the function, or an explicit key for other callables. Misses        *
+#         are looked up in batches, the least recently used entries are evicted above a size limit, and WAL journaling      *
+#         with one connection per process makes it safe for concurrent worker processes. When an analyzer is given a        *
+#         cache, overlapping studies only evaluate the new points.                                                          *
 #                                                                                                                           *
 #       Example Workflow:                                                                                                   *
 #       - Define parameter ranges `param_ranges` and the function `my_func` to be analyzed.                                 * 
@@ -25,16 +44,240 @@
 
 
 
+import os
+import time
+import types
+import functools
+import itertools
+import pickle
+import sqlite3
+import hashlib
+import tempfile
 import numpy as np
 import math
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import pandas as pd
+from scipy.stats import qmc
+
+
+def _evaluate_points(func, columns):
+    """Call a scalar function on every point of a chunk; failed evaluations give NaN."""
+    results = np.empty(len(columns[0]))
+    for i, point in enumerate(zip(*columns)):
+        try:
+            results[i] = func(*point)
+        except Exception:
+            results[i] = np.nan
+    return results
+
+
+def _evaluate_vectorized(func, columns):
+    """Call a vectorized function on the columns of a batch of points."""
+    with np.errstate(all='ignore'):
+        return np.broadcast_to(func(*columns), columns[0].shape).astype(float)
+
+
+class EvaluationCache:
+    def __init__(self, path, max_bytes=2**30, timeout=60.0):
+        self.path = path
+        self.max_bytes = max_bytes                                                           # Size limit of the stored results
+        self.timeout = timeout                                                               # Seconds to wait for another process's lock
+        self.hits = 0
+        self.misses = 0
+        self._connection_pid = None
+        self._connection = None
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value BLOB NOT NULL, "
+                           "size INTEGER NOT NULL, last_access REAL NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_by_access ON entries (last_access)")
+        connection.execute("CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY, bytes INTEGER NOT NULL)")
+        connection.execute("INSERT OR IGNORE INTO totals SELECT 0, COALESCE(SUM(size), 0) FROM entries")
+        connection.execute("CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries "      # Running total of the sizes
+                           "BEGIN UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0; END")
+        connection.execute("CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries "
+                           "BEGIN UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0; END")
+        connection.execute("COMMIT")
+
+    def _connect(self):
+        """Return this process's connection; connections are never shared across forked workers."""
+        if self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")                             # Readers never block the writer
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA recursive_triggers=ON")                          # REPLACE fires the delete trigger too
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connection'], state['_connection_pid'] = None, None
+        return state
+
+    @classmethod
+    def _fingerprint(cls, value, digest, seen):
+        """Feed a deterministic description of value into digest, following functions into their closures and globals."""
+        if isinstance(value, types.FunctionType):
+            if id(value) in seen:                                                            # Recursive functions
+                digest.update(f"<recursion {value.__module__}.{value.__qualname__}>".encode())
+                return
+            seen.add(id(value))
+            digest.update(f"<function {value.__module__}.{value.__qualname__}>".encode())
+            cls._fingerprint(value.__code__, digest, seen)
+            cls._fingerprint(value.__defaults__, digest, seen)
+            cls._fingerprint(value.__kwdefaults__, digest, seen)
+            for cell in value.__closure__ or ():
+                cls._fingerprint(cell.cell_contents, digest, seen)
+            for name in cls._global_names(value.__code__):
+                if name in value.__globals__:
+                    digest.update(name.encode())
+                    cls._fingerprint(value.__globals__[name], digest, seen)
+        elif isinstance(value, types.CodeType):
+            digest.update(value.co_code)
+            digest.update(f"<args {value.co_argcount} {value.co_posonlyargcount} {value.co_kwonlyargcount}>".encode())
+            for names in (value.co_names, value.co_varnames, value.co_freevars, value.co_cellvars):
+                digest.update(repr(names).encode())                                          # Attribute, method and variable names
+            for constant in value.co_consts:                                                 # Nested code objects have no stable repr
+                cls._fingerprint(constant, digest, seen)
+        elif isinstance(value, functools.partial):
+            digest.update(b"<partial>")
+            for part in (value.func, value.args, value.keywords):
+                cls._fingerprint(part, digest, seen)
+        elif isinstance(value, (tuple, list)):
+            digest.update(f"<{type(value).__name__} {len(value)}>".encode())
+            for item in value:
+                cls._fingerprint(item, digest, seen)
+        elif isinstance(value, dict):
+            digest.update(f"<dict {len(value)}>".encode())
+            for item_key in sorted(value, key=repr):
+                cls._fingerprint(item_key, digest, seen)
+                cls._fingerprint(value[item_key], digest, seen)
+        elif isinstance(value, np.ndarray):
+            digest.update(f"<ndarray {value.dtype.str} {value.shape}>".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, types.ModuleType):
+            digest.update(f"<module {value.__name__}>".encode())                             # Only the name: library code is not hashed
+        elif isinstance(value, (type, types.BuiltinFunctionType, np.ufunc)):
+            digest.update(f"<{type(value).__name__} {getattr(value, '__module__', '')}."
+                          f"{getattr(value, '__qualname__', value.__name__)}>".encode())
+        elif value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+            digest.update(f"<{type(value).__name__}>{value!r}".encode())
+        else:
+            raise TypeError(f"Cannot fingerprint a {type(value).__name__} used by the cached function; "
+                            f"pass an explicit key identifying the function and its version.")
+
+    @staticmethod
+    def _global_names(code):
+        """The global names used by code and by the code objects nested in it."""
+        names = set(code.co_names)
+        for constant in code.co_consts:
+            if isinstance(constant, types.CodeType):
+                names |= EvaluationCache._global_names(constant)
+        return sorted(names)
+
+    @classmethod
+    def function_identity(cls, func, key=None):
+        """
+        Hash of the function's code, constants, defaults, closure cells and the globals it references,
+        so that editing the function or a helper it calls invalidates its entries. An explicit key
+        (such as 'model-v3') replaces the fingerprint, for callables that cannot be fingerprinted.
+        """
+        digest = hashlib.sha256()
+        if key is not None:
+            digest.update(f"<key>{key!r}".encode())
+        else:
+            cls._fingerprint(func, digest, set())
+        return digest.digest()
+
+    def make_keys(self, func, columns, key=None):
+        """One content address per point: the hash of the function identity and the float64 parameter tuple."""
+        identity = self.function_identity(func, key)
+        rows = np.ascontiguousarray(np.column_stack(columns), dtype=np.float64)
+        return [hashlib.sha256(identity + row.tobytes()).digest() for row in rows]
+
+    def get_many(self, keys, batch_size=500):
+        """Return a dict of the cached results among keys, and mark them as recently used."""
+        connection = self._connect()
+        found = {}
+        for start in range(0, len(keys), batch_size):                                       # Stay under SQLite's parameter limit
+            batch = keys[start:start + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            for key, value in connection.execute(f"SELECT key, value FROM entries WHERE key IN ({placeholders})", batch):
+                found[key] = pickle.loads(value)
+        if found:
+            now = time.time()
+            touched = list(found)
+            connection.execute("BEGIN IMMEDIATE")                                            # One transaction for all the touches
+            try:
+                for start in range(0, len(touched), batch_size):
+                    batch = touched[start:start + batch_size]
+                    placeholders = ','.join('?' * len(batch))
+                    connection.execute(f"UPDATE entries SET last_access = ? WHERE key IN ({placeholders})", [now] + batch)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys, values):
+        """Store results in one transaction, then evict the least recently used entries above max_bytes."""
+        now = time.time()
+        rows = []
+        for key, value in zip(keys, values):
+            blob = pickle.dumps(value)
+            rows.append((key, blob, len(blob), now))
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")                                                # Take the write lock up front
+        try:
+            connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection):
+        excess = connection.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def lookup(self, func, columns, key=None):
+        """Return (values, missing, keys): cached values with NaN where missing is True."""
+        keys = self.make_keys(func, columns, key)
+        found = self.get_many(keys)
+        values = np.array([found.get(key, np.nan) for key in keys], dtype=float)
+        missing = np.array([key not in found for key in keys], dtype=bool)
+        return values, missing, keys
+
+    def store(self, keys, values):
+        """Store the evaluated results; NaN results (failed evaluations) are not cached."""
+        keep = [(key, float(value)) for key, value in zip(keys, values) if not np.isnan(value)]
+        if keep:
+            self.put_many(*zip(*keep))
+
+    def stats(self):
+        connection = self._connect()
+        count = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        size = connection.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+        return {'entries': count, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
 
 
 class SimpleSensitivityAnalyzer:
-    def __init__(self, param_ranges, func):
+    def __init__(self, param_ranges, func, cache=None, cache_key=None):
         self.param_ranges = param_ranges
         self.func = func
+        self.cache = cache                                                                   # An optional EvaluationCache
+        self.cache_key = cache_key                                                           # Explicit identity of func in the cache
 
     def perform_analysis(self):
         results = []
@@ -50,6 +293,195 @@ class SimpleSensitivityAnalyzer:
         df = pd.DataFrame(results, columns=['x_1', 'x_2', 'x_3', 'Result'])
         return df
 
+    def grid_shape(self):
+        return tuple(len(values) for values in self.param_ranges.values())
+
+    def iter_grid_chunks(self, chunk_size=2**20):
+        """Yield (start, columns) for consecutive chunks of the Cartesian grid, in C order over the parameters."""
+        shape = self.grid_shape()
+        ranges = [np.asarray(values) for values in self.param_ranges.values()]
+        total = int(np.prod(shape))
+        for start in range(0, total, chunk_size):
+            indices = np.unravel_index(np.arange(start, min(start + chunk_size, total)), shape)
+            yield start, [values[index] for values, index in zip(ranges, indices)]
+
+    def _accepts_arrays(self, columns, probe_size=2):
+        """Try func on a few points of a chunk and report whether it returns one value per point."""
+        probe = [column[:probe_size] for column in columns]
+        try:
+            with np.errstate(all='ignore'):
+                result = np.asarray(self.func(*probe), dtype=float)
+            np.broadcast_to(result, probe[0].shape)
+        except (TypeError, ValueError):                                                      # math functions, if statements on arrays, ...
+            return False
+        return True
+
+    def evaluate_grid(self, chunk_size=2**20, vectorized=None, num_workers=None, store_params=True, path=None):
+        """
+        Evaluate func on the whole grid and return a DataFrame with one column per parameter and a 'Result' column.
+        A vectorized func receives one array per parameter; otherwise func is called per point on a process pool.
+        By default (vectorized=None) a vectorized call is tried on a few points first, falling back to the pool.
+        With store_params=False only the results are kept, and with path they are memory-mapped to that file.
+        """
+        names = list(self.param_ranges)
+        total = int(np.prod(self.grid_shape()))
+        num_columns = len(names) + 1 if store_params else 1
+        if path is None:
+            table = np.empty((num_columns, total))                                            # Columnar: one contiguous row per column
+        else:
+            table = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(num_columns, total))
+
+        chunks = self.iter_grid_chunks(chunk_size)
+        if vectorized is None:
+            first = next(chunks, None)
+            vectorized = first is None or self._accepts_arrays(first[1])
+            chunks = itertools.chain([first] if first else [], chunks)
+        if vectorized:
+            results = ((start, columns, self._evaluate_cached(columns, _evaluate_vectorized))
+                       for start, columns in chunks)
+            self._store_chunks(table, results, store_params)
+        else:
+            num_workers = num_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                pending = {}
+                for start, columns in chunks:
+                    lookup = self.cache.lookup(self.func, columns, self.cache_key) if self.cache else None
+                    missing_columns = columns if lookup is None else [column[lookup[1]] for column in columns]
+                    pending[start] = (columns, executor.submit(_evaluate_points, self.func, missing_columns), lookup)
+                    if len(pending) > 2 * num_workers:                                         # Bound the chunks held in memory
+                        self._store_chunks(table, self._collect(pending, keep=num_workers), store_params)
+                self._store_chunks(table, self._collect(pending, keep=0), store_params)
+
+        failed = int(np.count_nonzero(np.isnan(table[-1])))
+        if failed:
+            print(f"{failed} of {total} grid points could not be evaluated and were set to NaN.")
+        return pd.DataFrame(dict(zip(names + ['Result'] if store_params else ['Result'], table)), copy=False)
+
+    def _collect(self, pending, keep):
+        """Pop the oldest submitted chunks until only keep are still pending."""
+        while len(pending) > keep:
+            start = min(pending)
+            columns, future, lookup = pending.pop(start)
+            yield start, columns, future.result() if lookup is None else self._merge(lookup, future.result())
+
+    def _merge(self, lookup, computed):
+        """Fill the cache misses of a lookup with the computed values and store them."""
+        values, missing, keys = lookup
+        values[missing] = computed
+        self.cache.store([key for key, miss in zip(keys, missing) if miss], computed)
+        return values
+
+    def _evaluate_cached(self, columns, evaluate):
+        """evaluate(func, columns) on the points of columns that are not in the cache."""
+        if self.cache is None:
+            return evaluate(self.func, columns)
+        lookup = self.cache.lookup(self.func, columns, self.cache_key)
+        if not lookup[1].any():
+            return lookup[0]
+        return self._merge(lookup, evaluate(self.func, [column[lookup[1]] for column in columns]))
+
+    @staticmethod
+    def _store_chunks(table, results, store_params):
+        for start, columns, values in results:
+            stop = start + len(values)
+            if store_params:
+                for row, column in enumerate(columns):
+                    table[row, start:stop] = column
+            table[-1, start:stop] = values
+
+    def _bounds(self):
+        lower = np.array([np.min(values) for values in self.param_ranges.values()], dtype=float)
+        upper = np.array([np.max(values) for values in self.param_ranges.values()], dtype=float)
+        return lower, upper
+
+    def _evaluate_unit_points(self, unit_points, batch_size, num_workers):
+        """Scale points from the unit hypercube to the parameter bounds and evaluate func in vectorized batches."""
+        lower, upper = self._bounds()
+        points = lower + (upper - lower) * unit_points
+        batches = [list(points[start:start + batch_size].T) for start in range(0, len(points), batch_size)]
+        if num_workers == 1:
+            return np.concatenate([self._evaluate_cached(columns, _evaluate_vectorized) for columns in batches])
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            evaluate = lambda func, columns: np.concatenate(list(executor.map(
+                _evaluate_vectorized, [func] * len(batches), self._split(columns, len(batches)))))
+            return self._evaluate_cached([points[:, j] for j in range(points.shape[1])], evaluate)
+
+    @staticmethod
+    def _split(columns, num_batches):
+        """Split columns into num_batches batches of consecutive points."""
+        edges = np.linspace(0, len(columns[0]), num_batches + 1).astype(int)
+        return [[column[a:b] for column in columns] for a, b in zip(edges[:-1], edges[1:])]
+
+    @staticmethod
+    def _bootstrap_interval(estimates, confidence):
+        """Percentile interval over the first axis of bootstrap estimates."""
+        tail = 100 * (1 - confidence) / 2
+        return np.percentile(estimates, tail, axis=0), np.percentile(estimates, 100 - tail, axis=0)
+
+    def sobol_indices(self, num_base_samples=2**12, num_resamples=500, confidence=0.95,
+                      batch_size=2**16, num_workers=1, seed=None):
+        """
+        First-order (Saltelli) and total (Jansen) Sobol indices from N * (d + 2) evaluations,
+        with bootstrap confidence intervals computed by resampling the rows of the design.
+        """
+        names = list(self.param_ranges)
+        d = len(names)
+        rng = np.random.default_rng(seed)
+        base = qmc.Sobol(d=2 * d, scramble=True, seed=rng).random(num_base_samples)
+        A, B = base[:, :d], base[:, d:]
+        AB = np.repeat(A[None], d, axis=0)                                                   # AB[i] is A with column i taken from B
+        AB[np.arange(d), :, np.arange(d)] = B.T
+        values = self._evaluate_unit_points(np.concatenate((A, B, AB.reshape(-1, d))), batch_size, num_workers)
+        f_A, f_B = values[:num_base_samples], values[num_base_samples:2 * num_base_samples]
+        f_AB = values[2 * num_base_samples:].reshape(d, num_base_samples)
+
+        def estimate(rows):
+            a, b, ab = f_A[rows], f_B[rows], np.moveaxis(f_AB[:, rows], 0, -2)               # Shapes (..., N) and (..., d, N)
+            variance = np.concatenate((a, b), axis=-1).var(axis=-1)[..., None]
+            first = np.mean(b[..., None, :] * (ab - a[..., None, :]), axis=-1) / variance
+            total = 0.5 * np.mean((a[..., None, :] - ab) ** 2, axis=-1) / variance
+            return first, total
+
+        first, total = estimate(np.arange(num_base_samples))
+        resamples = rng.integers(0, num_base_samples, size=(num_resamples, num_base_samples))
+        boot_first, boot_total = estimate(resamples)
+        first_low, first_high = self._bootstrap_interval(boot_first, confidence)
+        total_low, total_high = self._bootstrap_interval(boot_total, confidence)
+        return pd.DataFrame({'S1': first, 'S1_low': first_low, 'S1_high': first_high,
+                             'ST': total, 'ST_low': total_low, 'ST_high': total_high}, index=names)
+
+    def morris_screening(self, num_trajectories=100, num_levels=4, num_resamples=500, confidence=0.95,
+                         batch_size=2**16, num_workers=1, seed=None):
+        """
+        Morris elementary effects, in output units per unit-scaled parameter step, from random trajectories
+        on a grid of num_levels levels, with a bootstrap confidence interval on mu* over the trajectories.
+        """
+        names = list(self.param_ranges)
+        d = len(names)
+        rng = np.random.default_rng(seed)
+        delta = num_levels / (2 * (num_levels - 1))
+        start_levels = np.arange(int(np.ceil((1 - delta) * (num_levels - 1))) + 1) / (num_levels - 1)
+        start_levels = start_levels[start_levels <= 1 - delta + 1e-12]
+        direction = rng.choice([-1.0, 1.0], size=(num_trajectories, d))
+        start = rng.choice(start_levels, size=(num_trajectories, d)) + delta * (direction < 0)   # x + direction * delta stays in [0, 1]
+        order = np.argsort(rng.random((num_trajectories, d)), axis=1)                          # Random order of the one-at-a-time moves
+
+        steps = np.zeros((num_trajectories, d + 1, d))
+        rows = np.arange(num_trajectories)
+        for k in range(d):
+            steps[:, k + 1] = steps[:, k]
+            steps[rows, k + 1, order[:, k]] = direction[rows, order[:, k]] * delta
+        points = start[:, None, :] + steps
+        values = self._evaluate_unit_points(points.reshape(-1, d), batch_size, num_workers).reshape(num_trajectories, d + 1)
+
+        effects = np.empty((num_trajectories, d))
+        effects[rows[:, None], order] = np.diff(values, axis=1) / (direction[rows[:, None], order] * delta)
+        resamples = rng.integers(0, num_trajectories, size=(num_resamples, num_trajectories))
+        mu_star_low, mu_star_high = self._bootstrap_interval(np.abs(effects)[resamples].mean(axis=1), confidence)
+        return pd.DataFrame({'mu': effects.mean(axis=0), 'mu_star': np.abs(effects).mean(axis=0),
+                             'sigma': effects.std(axis=0, ddof=1), 'mu_star_low': mu_star_low,
+                             'mu_star_high': mu_star_high}, index=names)
+
     def plot(self, df):
         if 'Result' in df.columns:
             pd.plotting.scatter_matrix(df[['x_1', 'x_2', 'Result']], alpha=0.2, figsize=(10, 10), diagonal='kde')
@@ -62,6 +494,16 @@ def my_func(x_1, x_2, x_3):
     return math.log(x_1 / x_2 + x_3)
 
 
+def my_func_vectorized(x_1, x_2, x_3):
+    return np.log(x_1 / x_2 + x_3)
+
+
+def sobol_g_function(*x):
+    """Sobol's g-function on [0, 1]^d; a small coefficient a_i makes x_i important."""
+    a = np.array([0, 1, 4.5, 9] + [99] * (len(x) - 4))[:len(x)]
+    return np.prod([(np.abs(4 * xi - 2) + ai) / (1 + ai) for xi, ai in zip(x, a)], axis=0)
+
+
 def main():
     param_ranges = {
         'x_1': np.arange(10, 100, 10),
@@ -78,6 +520,41 @@ def main():
     else:
         print("No data available to plot.")
 
+    grid_df = analyzer.evaluate_grid(num_workers=2)                                         # my_func is scalar: detected, run on a process pool
+    print(f"\n---> Process pool grid matches the loops: {np.allclose(grid_df['Result'], results_df['Result'])}")
+
+    large_ranges = {                                                                        # 10^7 points, evaluated in vectorized chunks
+        'x_1': np.linspace(10, 100, 250),
+        'x_2': np.linspace(1, 10, 200),
+        'x_3': np.linspace(1, 10, 200),
+    }
+    large_df = SimpleSensitivityAnalyzer(large_ranges, my_func_vectorized).evaluate_grid()
+    print(f"---> Vectorized grid of {len(large_df):,} points, results between "
+          f"{large_df['Result'].min():.3f} and {large_df['Result'].max():.3f}\n")
+
+    analyzer = SimpleSensitivityAnalyzer(param_ranges, my_func_vectorized)
+    print(analyzer.sobol_indices(seed=1).round(3), "\n")
+
+    g_ranges = {f'x_{i}': np.array([0.0, 1.0]) for i in range(1, 21)}                      # 20 parameters, 45,056 evaluations
+    g_analyzer = SimpleSensitivityAnalyzer(g_ranges, sobol_g_function)
+    ranking = g_analyzer.sobol_indices(num_base_samples=2**11, num_workers=2, seed=1)
+    print(ranking.sort_values('ST', ascending=False).head(6).round(3), "\n")
+    print(g_analyzer.morris_screening(num_trajectories=200, seed=1).sort_values('mu_star', ascending=False).head(6).round(3))
+
+    cache = EvaluationCache(os.path.join(tempfile.gettempdir(), 'sensitivity_cache.sqlite'), max_bytes=2**26)
+    first = SimpleSensitivityAnalyzer(param_ranges, my_func, cache=cache)
+    first.evaluate_grid(vectorized=False, num_workers=2)
+    shifted_ranges = dict(param_ranges, x_1=np.arange(50, 140, 10))                            # Overlaps the first study on 4 of 9 values
+    second = SimpleSensitivityAnalyzer(shifted_ranges, my_func, cache=cache)
+    before = cache.misses
+    second.evaluate_grid(vectorized=False, num_workers=2)
+    print(f"\n---> Second study evaluated {cache.misses - before} of {int(np.prod(second.grid_shape()))} points; "
+          f"cache stats: {cache.stats()}")
+    log_model = lambda x_1, x_2, x_3: math.log(x_1 / x_2 + x_3)
+    exp_model = lambda x_1, x_2, x_3: math.exp(x_1 / x_2 + x_3)                                 # The same bytecode, another attribute name
+    changed = EvaluationCache.function_identity(log_model) != EvaluationCache.function_identity(exp_model)
+    print(f"---> Replacing math.log with math.exp changes the cache identity: {changed}\n")
+
 
 if __name__ == "__main__":
     main()
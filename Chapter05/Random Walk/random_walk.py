@@ -4,16 +4,24 @@
 #                                                                                                                       *
 #       This code defines a class `RandomWalk` that simulates a one-dimensional random walk and visualizes the          *
 #       path of the walk. In a random walk, each step is either +1 or -1, chosen with equal probability, and            *
-#       the position at each step is updated accordingly.                                                               *
+#       the position at each step is updated accordingly. Paths longer than max_points are drawn through the            *
+#       shared level-of-detail renderer of Chapter 3.                                                                   *
 #                                                                                                                       *
 # ***********************************************************************************************************************
 
 
 
+import os
 import random
+import sys
 import matplotlib.pyplot as plt
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                             'Chapter03', 'Downsampling Renderer'))
+from downsampling_renderer import plot_downsampled
+
+
 class RandomWalk:
     def __init__(self, seed_value=1, steps=1000):
         self.seed_value = seed_value
@@ -29,8 +37,11 @@ class RandomWalk:
             xn_value = self.path[-1] + zn_value
             self.path.append(xn_value)
     
-    def plot_path(self):
-        plt.plot(self.path)
+    def plot_path(self, max_points=4000):
+        if len(self.path) > max_points:
+            plot_downsampled(self.path, num_points=max_points)
+        else:
+            plt.plot(self.path)
         plt.title("Random Walk Path")
         plt.xlabel("Steps")
         plt.ylabel("Position")
@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -7,6 +9,11 @@ from pandas.plotting import register_matplotlib_converters
 register_matplotlib_converters()
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                             'Chapter03', 'Downsampling Renderer'))
+from downsampling_renderer import plot_downsampled
+
+
 class StockPriceSimulation:
     def __init__(self, file_path, num_intervals=2515, iterations=20):
         self.file_path = file_path
@@ -59,9 +66,12 @@ class StockPriceSimulation:
         for t in range(1, self.num_intervals):
             self.stock_prices[t] = self.stock_prices[t - 1] * self.daily_returns[t]
 
-    def plot_simulation(self):
+    def plot_simulation(self, max_points=4000):
         plt.figure(figsize=(10, 5))
-        plt.plot(self.stock_prices)
+        if len(self.stock_prices) > max_points:
+            plot_downsampled(self.stock_prices, num_points=max_points)
+        else:
+            plt.plot(self.stock_prices)
         amzn_trend = np.array(self.stock_data.iloc[:, 0:1])
         plt.plot(amzn_trend, 'k*')
         plt.show()
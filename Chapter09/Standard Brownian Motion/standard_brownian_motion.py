@@ -1,7 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                             'Chapter03', 'Downsampling Renderer'))
+from downsampling_renderer import plot_downsampled
+
+
 class StochasticBrownianMotion:
     def __init__(self, n=1000, seed=4):
         self.n = n
@@ -20,8 +27,11 @@ class StochasticBrownianMotion:
             Yk += self.sqn * self.z_values[k]
             self.sb_motion.append(Yk)
 
-    def plot_motion(self):
-        plt.plot(self.sb_motion)
+    def plot_motion(self, max_points=4000):
+        if len(self.sb_motion) > max_points:
+            plot_downsampled(self.sb_motion, num_points=max_points)
+        else:
+            plt.plot(self.sb_motion)
         plt.title("Stochastic Brownian Motion Simulation")
         plt.xlabel("Step")
         plt.ylabel("Position")